@@ -2,14 +2,177 @@
 # GitHub username: hsidhu1332
 # Date: 12/8/2023
 # Description: # Creating a chess match using chess piece objects and a class
-#                to keep score. The board is initialized using a dictionary and
-#                is then filled with objects based on each chess piece. Each
-#                piece inherits a base chess piece class that has basic properties
-#                such as name and color. Each class has a valid move method that
-#                determines if the move is valid for the piece and returns true or
-#                false which allows the ChessVar class to either make the move or not.
-#                The game state is checked based on if any chess piece of a type is
-#                present and if not changes the game state variable.
+#                to keep score. The board is initialized using a list of the 64
+#                squares and is then filled with objects based on each chess
+#                piece. Each piece inherits a base chess piece class that has
+#                basic properties such as name and color. There is only one
+#                object for each piece type and color, which every square with
+#                that piece shares, so anything about a single pawn like whether
+#                it has made its first move is kept by the board instead. Each
+#                class has a valid move method that determines if the move is
+#                valid for the piece and returns true or false which allows the
+#                ChessVar class to either make the move or not.
+#                The game state is checked based on a count of each piece type
+#                that is lowered on every capture, and if any type reaches zero
+#                the game state variable is changed.
+
+import random
+import time
+
+# the piece types in the order the game state checks them
+PIECE_NAMES = ('pawn', 'rook', 'knight', 'bishop', 'queen', 'king')
+
+COLORS = ('white', 'black')
+
+# every value the game state can have
+GAME_STATES = ('UNFINISHED', 'WHITE_WON', 'BLACK_WON')
+
+# the letter used for each piece index in to_fen, white in capitals
+FEN_LETTERS = 'PRNBQKprnbqk'
+
+# how many of each piece type a color starts with
+STARTING_COUNTS = {'pawn': 8, 'rook': 2, 'knight': 2, 'bishop': 2, 'queen': 1, 'king': 1}
+
+# squares are stored as an index from 0 to 63, going across each row
+# starting from a1, so a1 is 0, h1 is 7, a2 is 8 and h8 is 63
+FILES = 'abcdefgh'
+RANKS = '12345678'
+SQUARE_NAMES = tuple(x + y for y in RANKS for x in FILES)
+SQUARE_INDEX = {name: index for index, name in enumerate(SQUARE_NAMES)}
+
+# the column and row of each square, both starting at 0
+_FILE_OF = tuple(index % 8 for index in range(64))
+_RANK_OF = tuple(index // 8 for index in range(64))
+
+# the (column, row) step of each direction, the first four are the
+# straight directions a rook uses and the last four are the diagonals
+DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, 1), (1, -1), (-1, -1))
+ROOK_DIRECTIONS = (0, 1, 2, 3)
+BISHOP_DIRECTIONS = (4, 5, 6, 7)
+QUEEN_DIRECTIONS = ROOK_DIRECTIONS + BISHOP_DIRECTIONS
+
+
+def _build_rays():
+    """
+    Builds a tuple for every square holding, for each direction, the
+    squares a sliding piece passes over in order until the edge of the board
+    """
+    rays = []
+    for index in range(64):
+        square_rays = []
+        for x_step, y_step in DIRECTIONS:
+            ray = []
+            x = _FILE_OF[index] + x_step
+            y = _RANK_OF[index] + y_step
+            while 0 <= x < 8 and 0 <= y < 8:
+                ray.append(y * 8 + x)
+                x += x_step
+                y += y_step
+            square_rays.append(tuple(ray))
+        rays.append(tuple(square_rays))
+    return tuple(rays)
+
+
+def _build_direction_table(rays):
+    """
+    Builds a flat table that gives the direction needed to slide from one
+    square to another, looked up with initial * 64 + final. Squares that
+    are not on a shared line get None
+    """
+    table = [None] * (64 * 64)
+    for index in range(64):
+        for direction, ray in enumerate(rays[index]):
+            for square in ray:
+                table[index * 64 + square] = direction
+    return tuple(table)
+
+
+def _build_jumps(steps):
+    """
+    Builds a frozenset for every square of the squares reached by each
+    of the (column, row) steps that stay on the board
+    """
+    jumps = []
+    for index in range(64):
+        targets = set()
+        for x_step, y_step in steps:
+            x = _FILE_OF[index] + x_step
+            y = _RANK_OF[index] + y_step
+            if 0 <= x < 8 and 0 <= y < 8:
+                targets.add(y * 8 + x)
+        jumps.append(frozenset(targets))
+    return tuple(jumps)
+
+
+RAYS = _build_rays()
+_DIRECTION_BETWEEN = _build_direction_table(RAYS)
+KNIGHT_TARGETS = _build_jumps(((2, 1), (2, -1), (-2, 1), (-2, -1),
+                               (1, 2), (1, -2), (-1, 2), (-1, -2)))
+KING_TARGETS = _build_jumps(DIRECTIONS)
+
+# the Zobrist keys are drawn from a random.Random seeded with this number,
+# which gives the same keys on every machine and Python version, so hashes
+# can be compared between processes
+ZOBRIST_SEED = 20231208
+
+
+def _build_zobrist_keys():
+    """
+    Builds the random 64 bit keys used for hashing a position. There is
+    a key for every piece index on every square, a key for each square a
+    pawn can still make its first move from, and a key for black to move
+    """
+    rng = random.Random(ZOBRIST_SEED)
+    piece_keys = tuple(tuple(rng.getrandbits(64) for _ in range(64))
+                       for _ in range(len(COLORS) * len(PIECE_NAMES)))
+    first_move_keys = tuple(rng.getrandbits(64) for _ in range(64))
+    black_key = rng.getrandbits(64)
+    return piece_keys, first_move_keys, black_key
+
+
+ZOBRIST_PIECE_KEYS, ZOBRIST_FIRST_MOVE_KEYS, ZOBRIST_BLACK_KEY = _build_zobrist_keys()
+
+
+def moved_hash(position_hash, first_moves, piece, captured, initial, final):
+    """
+    Returns the hash and the mask of pawns that have not moved after the
+    piece moves from the initial to the final square index, capturing the
+    captured piece if it is not None
+    """
+    # take out the old keys and put in the new
+    index = piece.get_index()
+    position_hash ^= (ZOBRIST_BLACK_KEY ^ ZOBRIST_PIECE_KEYS[index][initial]
+                      ^ ZOBRIST_PIECE_KEYS[index][final])
+
+    # a pawn only loses its first move once it has actually moved, and
+    # a captured pawn takes its first move with it
+    if first_moves >> initial & 1:
+        first_moves ^= 1 << initial
+        position_hash ^= ZOBRIST_FIRST_MOVE_KEYS[initial]
+    if first_moves >> final & 1:
+        first_moves ^= 1 << final
+        position_hash ^= ZOBRIST_FIRST_MOVE_KEYS[final]
+    if captured is not None:
+        position_hash ^= ZOBRIST_PIECE_KEYS[captured.get_index()][final]
+    return position_hash, first_moves
+
+
+def zobrist_hash(board, turn, first_moves):
+    """
+    Hashes a board list, the side to move and the mask of pawns that have
+    not moved from scratch. ChessVar keeps the same value up to date after
+    every move
+    """
+    result = 0
+    for square, piece in enumerate(board):
+        if piece is not None:
+            result ^= ZOBRIST_PIECE_KEYS[piece.get_index()][square]
+            if first_moves >> square & 1:
+                result ^= ZOBRIST_FIRST_MOVE_KEYS[square]
+    if turn == 'black':
+        result ^= ZOBRIST_BLACK_KEY
+    return result
+
 
 class ChessVar:
     """
@@ -17,47 +180,262 @@ class ChessVar:
     It will also track who has won the game or if it is ongoing.
     """
 
-    def __init__(self):
-        self._final_yInt = None
-        self._final_xInt = None
-        self._initial_yInt = None
-        self._initial_xInt = None
+    def __new__(cls, engine='mailbox', *args, **kwargs):
+        """
+        Makes a BitboardGame from bitboard.py instead when the bitboard
+        engine is asked for
+        """
+        if cls is ChessVar and engine == 'bitboard':
+            from bitboard import BitboardGame
+            cls = BitboardGame
+        return super().__new__(cls)
+
+    def __init__(self, engine='mailbox', cache=None, profiler=None):
+        self._set_defaults(engine)
+        self._cache = cache
+        self._profiler = profiler
+        self.initialize_board()
+
+    def _set_defaults(self, engine):
+        """
+        Sets every attribute of a new game before a position is put on the
+        board, either by initialize_board or by one of the restore methods
+        """
+        if engine not in ('mailbox', 'bitboard'):
+            raise ValueError("engine must be 'mailbox' or 'bitboard'")
+        self._engine = engine
+        # the board list of the default engine, a BitboardGame keeps the
+        # position in _bitboards instead
         self._board = None
+        self._first_moves = 0
+        self._bitboards = None
+        # the AttackMaps from bitboard.py, made the first time they are asked
+        # for and kept up to date on every move after that
+        self._attack_maps = None
+        self._piece_counts = None
+        self._undo_stack = []
+        # True if the board, counts or bitboards may be shared with a clone
+        # and have to be copied before they are changed
+        self._shared = False
+        self._hash = 0
+        # an optional MoveCache from movecache.py shared between games
+        self._cache = None
+        # an optional Profiler from profiling.py that times make_move
+        self._profiler = None
+        # why find_move last turned down a move
+        self._rejection = None
+        # functions called with a MoveEvent from events.py after each move
+        # make_move makes
+        self._subscribers = []
         self._game_state = 'UNFINISHED'
         self._turn = 'white'
-        self.initialize_board()
 
     def initialize_board(self):
         """
-        Initializes the board to a dictionary and fills out the 8x8
-        grid with None before creating the default positions for
-        every piece
-        """
-        self._board = {}
-        x_axis = 'abcdefgh'
-        y_axis = '12345678'
-
-        # fill the board with coordinate keys and None values
-        for x in x_axis:
-            for y in y_axis:
-                self._board[x + y] = None
-
-        # fill the 2 and 7th row with pawns
-        for x in x_axis:
-            self._board[x + '2'] = Pawn('white')
-            self._board[x + '7'] = Pawn('black')
-
-        # initialize the rest of the pieces
-        self._board['a1'] = self._board['h1'] = Rook('white')
-        self._board['a8'] = self._board['h8'] = Rook('black')
-        self._board['b1'] = self._board['g1'] = Knight('white')
-        self._board['b8'] = self._board['g8'] = Knight('black')
-        self._board['c1'] = self._board['f1'] = Bishop('white')
-        self._board['c8'] = self._board['f8'] = Bishop('black')
-        self._board['d1'] = Queen('white')
-        self._board['d8'] = Queen('black')
-        self._board['e1'] = King('white')
-        self._board['e8'] = King('black')
+        Initializes the board to a list with one spot for each of the 64
+        squares, copied from the starting board built once when the module
+        is loaded. Every square of the same piece type and color holds
+        the same shared piece object
+        """
+        self._board = list(_STARTING_BOARD)
+        self._shared = False
+        self._attack_maps = None
+
+        # the pawns on the 2 and 7th row have not made their first move
+        self._first_moves = _STARTING_FIRST_MOVES
+
+        # moves made with push_move that can be taken back
+        self._undo_stack = []
+
+        # keep a count of each piece type so the game state can be checked
+        # without looking through the whole board
+        self._piece_counts = {color: dict(STARTING_COUNTS) for color in ('white', 'black')}
+
+        self._hash = starting_hash(self._turn)
+
+    def _set_position(self, board, turn, game_state, first_moves):
+        """
+        Puts a saved position on the board without replaying any moves.
+        The piece counts and hash are rebuilt from the board
+        """
+        self._board = board
+        self._shared = False
+        self._attack_maps = None
+        self._turn = turn
+        self._game_state = game_state
+        self._first_moves = first_moves
+        self._undo_stack = []
+        self._piece_counts = {color: dict.fromkeys(PIECE_NAMES, 0) for color in COLORS}
+        for piece in board:
+            if piece is not None:
+                self._piece_counts[piece.get_color()][piece.get_name()] += 1
+        self._hash = zobrist_hash(self._board, self._turn, self._first_moves)
+
+    def clone(self):
+        """
+        Returns a new game at the same position that can be played on its
+        own. The position is not copied until one of the two games makes a
+        move, so making many clones is cheap. The clone uses the same cache
+        and profiler, and can take back the moves this game could, but has
+        no subscribers
+        """
+        game = type(self).__new__(type(self))
+        game.__dict__.update(self.__dict__)
+        game._undo_stack = list(self._undo_stack)
+        game._subscribers = []
+        self._shared = True
+        game._shared = True
+        return game
+
+    def _unshare(self):
+        """
+        Gives the game its own copy of the board, piece counts and
+        attack maps before it changes them, if they may be shared
+        """
+        self._board = list(self._board)
+        self._piece_counts = {color: dict(counts) for color, counts in self._piece_counts.items()}
+        if self._attack_maps is not None:
+            self._attack_maps = self._attack_maps.copy()
+        self._shared = False
+
+    def _squares(self):
+        """
+        Returns the position as a list of the piece object (or None) on
+        each square index
+        """
+        return self._board
+
+    def to_fen(self):
+        """
+        Returns the position as a FEN style string with four fields: the
+        rows from 8 down to 1 (white pieces in capitals, numbers for empty
+        squares), w or b for the side to move, the squares of pawns that
+        have not made their first move (or -), and the game state.
+        Ex. the rows of the starting board are
+        'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR'
+        """
+        board = self._squares()
+        rows = []
+        for y in range(7, -1, -1):
+            row = ''
+            empty = 0
+            for piece in board[y * 8:y * 8 + 8]:
+                if piece is None:
+                    empty += 1
+                    continue
+                if empty:
+                    row += str(empty)
+                    empty = 0
+                row += FEN_LETTERS[piece.get_index()]
+            if empty:
+                row += str(empty)
+            rows.append(row)
+
+        first_moves = ''.join(SQUARE_NAMES[square] for square in range(64)
+                              if self._first_moves >> square & 1)
+        return ' '.join(('/'.join(rows), self._turn[0], first_moves or '-', self._game_state))
+
+    @classmethod
+    def from_fen(cls, fen, engine='mailbox'):
+        """
+        Returns a new game set to the position in a string from to_fen.
+        Raises ValueError if the string is not a valid position
+        """
+        fields = fen.split()
+        if len(fields) != 4:
+            raise ValueError('a position needs 4 fields: %r' % fen)
+        rows, turn, first_move_squares, game_state = fields
+
+        board = [None] * 64
+        rows = rows.split('/')
+        if len(rows) != 8:
+            raise ValueError('a position needs 8 rows: %r' % fen)
+        for y, row in zip(range(7, -1, -1), rows):
+            x = 0
+            for letter in row:
+                if letter.isdigit():
+                    x += int(letter)
+                elif letter in FEN_LETTERS and x < 8:
+                    board[y * 8 + x] = PIECES[FEN_LETTERS.index(letter)]
+                    x += 1
+                else:
+                    raise ValueError('bad row %r in position %r' % (row, fen))
+            if x != 8:
+                raise ValueError('bad row %r in position %r' % (row, fen))
+
+        if turn not in ('w', 'b'):
+            raise ValueError('the side to move must be w or b: %r' % fen)
+        if game_state not in GAME_STATES:
+            raise ValueError('unknown game state %r' % game_state)
+
+        first_moves = 0
+        if first_move_squares != '-':
+            for start in range(0, len(first_move_squares), 2):
+                square = SQUARE_INDEX.get(first_move_squares[start:start + 2])
+                if square is None or board[square] is None or board[square].get_name() != 'pawn':
+                    raise ValueError('bad first move squares %r' % first_move_squares)
+                first_moves |= 1 << square
+
+        game = cls.__new__(cls, engine)
+        game._set_defaults(engine)
+        game._set_position(board, 'white' if turn == 'w' else 'black', game_state, first_moves)
+        return game
+
+    def to_bytes(self):
+        """
+        Packs the position into 33 bytes. The 64 squares take 4 bits each
+        (32 bytes, square 0 in the low half of the first byte): 0 for empty,
+        1 to 12 for the piece index plus one, and 13 or 14 for a white or
+        black pawn that has not made its first move. The last byte holds
+        the side to move in bit 0 and the game state in bits 1 and 2
+        """
+        board = self._squares()
+        first_moves = self._first_moves
+        codes = [0] * 64
+        for square in range(64):
+            piece = board[square]
+            if piece is not None:
+                index = piece.get_index()
+                if first_moves >> square & 1:
+                    codes[square] = 13 if index == 0 else 14
+                else:
+                    codes[square] = index + 1
+        packed = bytearray(33)
+        for square in range(0, 64, 2):
+            packed[square // 2] = codes[square] | codes[square + 1] << 4
+        packed[32] = (self._turn == 'black') | GAME_STATES.index(self._game_state) << 1
+        return bytes(packed)
+
+    @classmethod
+    def from_bytes(cls, data, engine='mailbox'):
+        """
+        Returns a new game set to the position in bytes from to_bytes.
+        Raises ValueError if the bytes are not a valid position
+        """
+        if len(data) != 33:
+            raise ValueError('a packed position is 33 bytes, got %d' % len(data))
+        status = data[32]
+        if status >> 1 >= len(GAME_STATES):
+            raise ValueError('bad game state in packed position')
+
+        board = [None] * 64
+        first_moves = 0
+        for square in range(64):
+            code = data[square >> 1] >> ((square & 1) << 2) & 15
+            if code == 0:
+                continue
+            if code > 14:
+                raise ValueError('bad square in packed position')
+            if code > 12:
+                first_moves |= 1 << square
+                code = 1 if code == 13 else 7
+            board[square] = PIECES[code - 1]
+
+        game = cls.__new__(cls, engine)
+        game._set_defaults(engine)
+        game._set_position(board, 'black' if status & 1 else 'white',
+                           GAME_STATES[status >> 1], first_moves)
+        return game
 
     def get_game_state(self):
         """
@@ -67,76 +445,207 @@ class ChessVar:
 
     def update_game_state(self):
         """
-        Check if the game is completed by constantly checking if each of the
-        piece's quantity is removed based on their color. Updates game_state
-        depending on the color missing
-        """
-        # check if there is any instance of a piece and its color, sets the
-        # game state to the opposite color if it returns false
-        white_pawn_check = any(isinstance(piece, Pawn) and piece.get_color() == 'white'
-                               for piece in self._board.values())
-        if white_pawn_check is False:
-            self._game_state = 'BLACK_WON'
-
-        black_pawn_check = any(isinstance(piece, Pawn) and piece.get_color() == 'black'
-                               for piece in self._board.values())
-        if black_pawn_check is False:
-            self._game_state = 'WHITE_WON'
-
-        white_rook_check = any(isinstance(piece, Rook) and piece.get_color() == 'white'
-                               for piece in self._board.values())
-        if white_rook_check is False:
-            self._game_state = 'BLACK_WON'
-
-        black_rook_check = any(isinstance(piece, Rook) and piece.get_color() == 'black'
-                               for piece in self._board.values())
-        if black_rook_check is False:
-            self._game_state = 'WHITE_WON'
-
-        white_knight_check = any(isinstance(piece, Knight) and piece.get_color() == 'white'
-                               for piece in self._board.values())
-        if white_knight_check is False:
-            self._game_state = 'BLACK_WON'
-
-        black_knight_check = any(isinstance(piece, Knight) and piece.get_color() == 'black'
-                               for piece in self._board.values())
-        if black_knight_check is False:
-            self._game_state = 'WHITE_WON'
-
-        white_bishop_check = any(isinstance(piece, Bishop) and piece.get_color() == 'white'
-                               for piece in self._board.values())
-        if white_bishop_check is False:
-            self._game_state = 'BLACK_WON'
-
-        black_bishop_check = any(isinstance(piece, Bishop) and piece.get_color() == 'black'
-                               for piece in self._board.values())
-        if black_bishop_check is False:
-            self._game_state = 'WHITE_WON'
-
-        white_queen_check = any(isinstance(piece, Queen) and piece.get_color() == 'white'
-                               for piece in self._board.values())
-        if white_queen_check is False:
-            self._game_state = 'BLACK_WON'
-
-        black_queen_check = any(isinstance(piece, Queen) and piece.get_color() == 'black'
-                               for piece in self._board.values())
-        if black_queen_check is False:
-            self._game_state = 'WHITE_WON'
-
-        white_king_check = any(isinstance(piece, King) and piece.get_color() == 'white'
-                               for piece in self._board.values())
-        if white_king_check is False:
-            self._game_state = 'BLACK_WON'
-
-        black_king_check = any(isinstance(piece, King) and piece.get_color() == 'black'
-                               for piece in self._board.values())
-        if black_king_check is False:
-            self._game_state = 'WHITE_WON'
+        Check if the game is completed by checking the piece counts for
+        each color. If either color has no pieces left of a type, update
+        game_state to the opposite color winning
+        """
+        # go through the types in the same order every time so the result
+        # is the same as checking the whole board
+        for name in PIECE_NAMES:
+            if self._piece_counts['white'][name] == 0:
+                self._game_state = 'BLACK_WON'
+            if self._piece_counts['black'][name] == 0:
+                self._game_state = 'WHITE_WON'
+
+    def get_turn(self):
+        """
+        Returns the color of the side to move
+        """
+        return self._turn
+
+    def get_piece(self, square):
+        """
+        Returns the piece object on the square, ex 'a1', or None if the
+        square is empty
+        """
+        return self._board[SQUARE_INDEX[square]]
+
+    def piece_at(self, index):
+        """
+        Returns the piece object on the square index, or None if it is empty
+        """
+        return self._board[index]
+
+    def has_first_move(self, square):
+        """
+        Returns True if the square, ex 'a2', holds a pawn that has not
+        made its first move
+        """
+        return self._first_moves >> SQUARE_INDEX[square] & 1 == 1
+
+    def get_first_moves(self):
+        """
+        Returns a 64 bit mask with a bit set for every square index holding
+        a pawn that has not made its first move
+        """
+        return self._first_moves
+
+    def get_piece_count(self, color, name):
+        """
+        Returns how many pieces of the type the color has left on the board
+        """
+        return self._piece_counts[color][name]
+
+    def get_piece_counts(self, color):
+        """
+        Returns a dictionary of how many pieces of each type the color
+        has left on the board
+        """
+        return dict(self._piece_counts[color])
+
+    def position_hash(self):
+        """
+        Returns a 64 bit Zobrist hash of the pieces, the pawns that still
+        have their first move and the side to move. It is kept up to date
+        on every move and is the same in every process, see ZOBRIST_SEED
+        """
+        return self._hash
+
+    def get_bitboards(self):
+        """
+        Returns the Bitboards object used by the bitboard engine, or None
+        if the game is using the default engine
+        """
+        return self._bitboards
+
+    def _get_attack_maps(self):
+        """
+        Returns the attack maps, making them from the board the first time
+        """
+        if self._attack_maps is None:
+            from bitboard import AttackMaps
+            self._attack_maps = AttackMaps(self._squares(), self._first_moves)
+        return self._attack_maps
+
+    def attack_maps_match(self):
+        """
+        Returns True if the attack maps kept up to date on every move match
+        maps made again from the board, for checking the updates. Makes the
+        maps first if the game has none yet
+        """
+        from bitboard import AttackMaps
+
+        return self._get_attack_maps().matches(AttackMaps(self._squares(), self._first_moves))
+
+    def attacked_squares(self, color):
+        """
+        Returns a list of the spots, ex ['a3', 'b3'], that the color's
+        pieces attack, meaning one of them could capture an opposing piece
+        there. Includes spots held by the color's own pieces. A pawn that
+        has not made its first move does not attack anything
+        """
+        attacks = self._get_attack_maps().attacks(COLORS.index(color))
+        return [SQUARE_NAMES[square] for square in range(64) if attacks >> square & 1]
+
+    def endangered_types(self, color):
+        """
+        Returns the names of the color's piece types, in PIECE_NAMES order,
+        that are down to their last piece with that piece attacked by the
+        other color. Capturing it would leave none of the type, which
+        update_game_state counts as losing the game
+        """
+        counts = self.get_piece_counts(color)
+        last = [name for name in PIECE_NAMES if counts[name] == 1]
+        if not last:
+            return []
+        attacks = self._get_attack_maps().attacks(1 - COLORS.index(color))
+        endangered = set()
+        for square, piece in enumerate(self._squares()):
+            if (piece is not None and piece.get_color() == color and counts[piece.get_name()] == 1
+                    and attacks >> square & 1):
+                endangered.add(piece.get_name())
+        return [name for name in last if name in endangered]
+
+    def get_cache(self):
+        """
+        Returns the MoveCache the game uses, or None if it has none
+        """
+        return self._cache
+
+    def set_cache(self, cache):
+        """
+        Sets the MoveCache used to remember move checks and legal move
+        lists, or turns caching off if cache is None
+        """
+        self._cache = cache
+
+    def get_profiler(self):
+        """
+        Returns the Profiler timing make_move, or None if it has none
+        """
+        return self._profiler
+
+    def set_profiler(self, profiler):
+        """
+        Sets the Profiler used to time make_move, or turns timing off if
+        profiler is None
+        """
+        self._profiler = profiler
+
+    def get_rejection(self):
+        """
+        Returns why the last move find_move turned down was turned down, ex
+        'wrong_turn', or None if it has not turned one down
+        """
+        return self._rejection
+
+    def subscribe(self, subscriber):
+        """
+        Adds a function to be called with a MoveEvent after every move
+        make_move makes. Moves made with push_move, push_indexes or
+        apply_move, like the ones a search makes, do not make events
+        """
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber):
+        """
+        Removes a function added with subscribe. Raises ValueError if it
+        was not subscribed
+        """
+        self._subscribers.remove(subscriber)
+
+    def _publish(self, undo):
+        """
+        Makes a MoveEvent for a move just made from its undo tuple and
+        passes it to every subscriber
+        """
+        from events import MoveEvent
+
+        initial, final, piece, captured, turn, game_state = undo[:6]
+        event = MoveEvent(initial, final, piece, captured, self._turn,
+                          self._game_state if self._game_state != game_state else None,
+                          self._hash)
+        for subscriber in list(self._subscribers):
+            subscriber(event)
+
+    def make_move_event(self, initial_spot, final_spot):
+        """
+        Makes the move the same way as make_move, but returns the MoveEvent
+        for it, or None if the move was not made
+        """
+        events = []
+        subscriber = events.append
+        self._subscribers.append(subscriber)
+        try:
+            self.make_move(initial_spot, final_spot)
+        finally:
+            self._subscribers.remove(subscriber)
+        return events[0] if events else None
 
     def make_move(self, initial_spot, final_spot):
         """
-        Take the spots and get the dictionary object associated with the initial spot.
-        Use the object properties to check if it would be valid move
+        Take the spots, ex a2 and a4, and look up the square index of each.
+        Use the object at the initial spot to check if it would be valid move
         by comparing the turn counter to the color property of the object
         being moved. Also checks if the final spot contains an object
         of the same color, if the game is over, or if the move
@@ -144,71 +653,328 @@ class ChessVar:
         is valid based on the object. If the move is valid,
         move the object from its current spot to the final spot.
         """
+        if self._profiler is not None:
+            return self._profiled_move(initial_spot, final_spot)
 
-        if self._game_state != 'UNFINISHED':
+        move = self.find_move(initial_spot, final_spot)
+        if move is None:
+            return False
+        self._commit_move(move[0], move[1])
+        return True
+
+    def _commit_move(self, initial, final, profiler=None):
+        """
+        Makes a move make_move has checked and tells the subscribers. With
+        a profiler the board update and update_game_state are timed, the
+        same two steps apply_move runs
+        """
+        # moves made here can not be taken back, so any pushed moves before
+        # it can not be either
+        if self._undo_stack:
+            self._undo_stack.clear()
+        if profiler is None:
+            undo = self.apply_move(initial, final)
+        else:
+            clock = time.perf_counter
+            start = clock()
+            undo = self._move_piece(initial, final)
+            moved = clock()
+            profiler.record('move_piece', moved - start)
+            self.update_game_state()
+            profiler.record('update_game_state', clock() - moved)
+        if self._subscribers:
+            self._publish(undo)
+
+    def _profiled_move(self, initial_spot, final_spot):
+        """
+        Makes the move the same way as make_move, through find_move and
+        _commit_move with the profiler passed in, so each stage is timed
+        once in the move that is really made. Also times the whole of
+        find_move and make_move and tells the profiler why a move was
+        turned down
+        """
+        profiler = self._profiler
+        clock = time.perf_counter
+        start = clock()
+        move = self.find_move(initial_spot, final_spot, profiler)
+        profiler.record('find_move', clock() - start)
+        if move is None:
+            profiler.reject(self._rejection)
+            profiler.record('make_move', clock() - start)
             return False
 
-        bounds = self.check_bounds(initial_spot, final_spot)
+        self._commit_move(move[0], move[1], profiler)
+        profiler.accept()
+        profiler.record('make_move', clock() - start)
+        return True
 
-        if bounds:
+    def push_move(self, initial_spot, final_spot):
+        """
+        Makes the move the same way as make_move, but saves what is needed
+        to take it back with pop_move. Returns True if the move was made
+        """
+        move = self.find_move(initial_spot, final_spot)
+        if move is None:
             return False
+        self._undo_stack.append(self.apply_move(move[0], move[1]))
+        return True
+
+    def push_indexes(self, initial, final):
+        """
+        Same as push_move but takes square indexes for a move that is
+        already known to be legal, ex one from generate_moves. The move
+        is not checked again
+        """
+        self._undo_stack.append(self.apply_move(initial, final))
+
+    def pop_move(self):
+        """
+        Takes back the last move made with push_move or push_indexes and
+        returns it as a pair of spots. Raises IndexError if there are no
+        moves to take back
+        """
+        (initial, final, piece, captured, turn, game_state, first_moves,
+         position_hash) = self._undo_stack.pop()
+        if self._shared:
+            self._unshare()
+        self._board[initial] = piece
+        self._board[final] = captured
+        if captured is not None:
+            self._piece_counts[captured.get_color()][captured.get_name()] += 1
+        self._first_moves = first_moves
+        if self._attack_maps is not None:
+            self._attack_maps.update((initial, final), self._board, first_moves)
+        self._turn = turn
+        self._game_state = game_state
+        self._hash = position_hash
+        return SQUARE_NAMES[initial], SQUARE_NAMES[final]
+
+    def find_move(self, initial_spot, final_spot, profiler=None):
+        """
+        Checks if the move from the initial spot to the final spot can be
+        made. Returns the pair of square indexes if it can, otherwise None,
+        and saves the reason from profiling.REJECTION_REASONS for
+        get_rejection. With a profiler the bounds check and the piece's
+        move rules are timed
+        """
+        if self._game_state != 'UNFINISHED':
+            self._rejection = 'game_over'
+            return None
+
+        # spots that are not on the board have no index
+        if profiler is not None:
+            start = time.perf_counter()
+        initial = SQUARE_INDEX.get(initial_spot)
+        final = SQUARE_INDEX.get(final_spot)
+        if profiler is not None:
+            profiler.record('check_bounds', time.perf_counter() - start)
+        if initial is None or final is None:
+            self._rejection = 'out_of_bounds'
+            return None
+
+        piece = self._board[initial]
+        if piece is None:
+            self._rejection = 'empty_square'
+            return None
 
         # if there is a piece at the final spot check if it's the same color
-        if self._board[final_spot] is not None:
-            if self._board[final_spot].get_color() == self._board[initial_spot].get_color():
-                return False
+        captured = self._board[final]
+        if captured is not None and captured.get_color() == piece.get_color():
+            self._rejection = 'own_piece_capture'
+            return None
 
-        if self._board[initial_spot] is None:
-            return False
+        if self._turn != piece.get_color():
+            self._rejection = 'wrong_turn'
+            return None
 
-        if self._turn == self._board[initial_spot].get_color():
-            result = self._board[initial_spot].valid_move(initial_spot, final_spot, self._board)
-            # if the move is valid, update the board and check if the game is over
-            if result:
-                if self._turn == 'white':
-                    self._turn = 'black'
-                else:
-                    self._turn = 'white'
-                self._board[final_spot] = self._board[initial_spot]
-                self._board[initial_spot] = None
-                self.update_game_state()
-                return result
-            else:
-                return result
+        if profiler is None:
+            valid = self.is_valid_move(piece, initial, final)
         else:
-            return False
+            start = time.perf_counter()
+            valid = self.is_valid_move(piece, initial, final)
+            profiler.record('valid_move_' + piece.get_name(), time.perf_counter() - start)
+        if not valid:
+            self._rejection = 'illegal_geometry'
+            return None
+        return initial, final
+
+    def apply_move(self, initial, final):
+        """
+        Moves the piece between two square indexes without checking the
+        move, then checks if the game is over. Returns a tuple holding
+        everything pop_move needs to undo the move
+        """
+        undo = self._move_piece(initial, final)
+        self.update_game_state()
+        return undo
+
+    def _move_piece(self, initial, final):
+        """
+        Does the work of apply_move apart from checking if the game is over
+        """
+        if self._shared:
+            self._unshare()
+        piece = self._board[initial]
+        captured = self._board[final]
+        first_moves = self._first_moves
+        undo = (initial, final, piece, captured, self._turn, self._game_state,
+                first_moves, self._hash)
+
+        self._hash, first_moves = moved_hash(self._hash, first_moves, piece, captured,
+                                             initial, final)
+        self._first_moves = first_moves
+
+        if self._turn == 'white':
+            self._turn = 'black'
+        else:
+            self._turn = 'white'
+        # remove a captured piece from its color's count
+        if captured is not None:
+            self._piece_counts[captured.get_color()][captured.get_name()] -= 1
+        self._board[final] = piece
+        self._board[initial] = None
+        if self._attack_maps is not None:
+            self._attack_maps.update((initial, final), self._board, first_moves)
+        return undo
+
+    def is_valid_move(self, piece, initial, final):
+        """
+        Checks a move for the piece between two square indexes with the
+        engine the game is using. Does not check the turn or whether the
+        final square holds a piece of the same color
+        """
+        cache = self._cache
+        if cache is not None:
+            valid = cache.valid_move(self._hash, initial, final)
+            if valid is None:
+                valid = self._check_move(piece, initial, final)
+                cache.put_valid_move(self._hash, initial, final, valid)
+            return valid
+        return self._check_move(piece, initial, final)
+
+    def _check_move(self, piece, initial, final):
+        """
+        Checks a move for the piece with the engine, without the cache
+        """
+        return piece.valid_move(initial, final, self._board, self._first_moves >> initial & 1 == 1)
+
+    def generate_moves(self, initial=None):
+        """
+        Returns an iterator over every legal move for the side to move as a
+        pair of square indexes. If an initial square index is given only the
+        moves of the piece on that square are given. Moves are made lazily so
+        callers that stop early do not pay for the rest, unless the game has
+        a cache, in which case the whole list for the position is made and
+        saved.
+        """
+        if self._game_state != 'UNFINISHED':
+            return iter(())
+        cache = self._cache
+        if cache is not None and initial is None:
+            moves = cache.moves(self._hash)
+            if moves is None:
+                moves = tuple(self._generate_moves(None))
+                cache.put_moves(self._hash, moves)
+            return iter(moves)
+        return self._generate_moves(initial)
+
+    def _generate_moves(self, initial):
+        """
+        Yields the legal moves for generate_moves without the cache
+        """
+        board = self._board
+        turn = self._turn
+        first_moves = self._first_moves
+        if initial is None:
+            squares = range(64)
+        else:
+            squares = (initial,)
+        for square in squares:
+            piece = board[square]
+            if piece is None or piece.get_color() != turn:
+                continue
+            first_move = first_moves >> square & 1 == 1
+            for final in piece.move_candidates(square, board):
+                target = board[final]
+                if target is not None and target.get_color() == turn:
+                    continue
+                if piece.valid_move(square, final, board, first_move):
+                    yield square, final
+
+    def legal_moves(self):
+        """
+        Yields every move the side to move could make as a pair of
+        spots, ex ('a2', 'a4'), using the same rules as make_move
+        """
+        for initial, final in self.generate_moves():
+            yield SQUARE_NAMES[initial], SQUARE_NAMES[final]
+
+    def legal_moves_from(self, square):
+        """
+        Yields every move the piece on the square, ex 'b1', could make as a
+        pair of spots. Yields nothing if the square is empty, off the board
+        or holds a piece of the side not moving
+        """
+        initial = SQUARE_INDEX.get(square)
+        if initial is None:
+            return
+        for initial, final in self.generate_moves(initial):
+            yield SQUARE_NAMES[initial], SQUARE_NAMES[final]
 
     def check_bounds(self, initial_spot, final_spot):
         """
         Checks if the move being made would take the piece off the
         board
         """
-        self._initial_xInt = ord(initial_spot[0]) - ord('a') + 1
-        self._initial_yInt = int(initial_spot[1])
-        self._final_xInt = ord(final_spot[0]) - ord('a') + 1
-        self._final_yInt = int(final_spot[1])
-        # checks if the piece is on the 8x8 grid
-        if (0 < self._initial_xInt < 9 and 0 < self._initial_yInt < 9 and
-                0 < self._final_xInt < 9 and 0 < self._final_yInt < 9):
-            return False
-        else:
-            return True
+        return initial_spot not in SQUARE_INDEX or final_spot not in SQUARE_INDEX
+
+
+def _shared_piece(piece_class, name, color):
+    """
+    Returns the shared object for the piece class and color, used when
+    a piece is unpickled
+    """
+    return ChessPiece.__new__(piece_class, name, color)
 
 
 class ChessPiece():
     """
     A class representing a chess piece object. Will be
-    inherited by each piece Sets the name and color as well as
-    getting the integer coordinates of the piece.
+    inherited by each piece Sets the name and color. Pieces can not be
+    changed after they are made and there is only one object for each
+    piece class and color, so Pawn('white') is Pawn('white').
     """
 
-    def __init__(self, name, color):
-        self._name = name
-        self._color = color
-        self._initial_xInt = None
-        self._initial_yInt = None
-        self._final_xInt = None
-        self._final_yInt = None
+    __slots__ = ('_name', '_color', '_index')
+
+    # the shared piece objects, keyed by piece class and color
+    _shared = {}
+
+    def __new__(cls, name, color):
+        piece = ChessPiece._shared.get((cls, color))
+        if piece is None:
+            piece = super().__new__(cls)
+            object.__setattr__(piece, '_name', name)
+            object.__setattr__(piece, '_color', color)
+            object.__setattr__(piece, '_index',
+                               COLORS.index(color) * len(PIECE_NAMES) + PIECE_NAMES.index(name))
+            ChessPiece._shared[(cls, color)] = piece
+        return piece
+
+    def __setattr__(self, name, value):
+        raise AttributeError('chess pieces can not be changed')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return _shared_piece, (type(self), self._name, self._color)
+
+    def __repr__(self):
+        return '%s(%r)' % (type(self).__name__, self._color)
 
     def get_name(self):
         """
@@ -222,22 +988,57 @@ class ChessPiece():
         """
         return self._color
 
-    def valid_move(self, initial_spot, final_spot, board):
+    def get_index(self):
+        """
+        Returns a number from 0 to 11 for the color and type of the piece,
+        the six white types in PIECE_NAMES order followed by the black ones
+        """
+        return self._index
+
+    def valid_move(self, initial_spot, final_spot, board, first_move=False):
         """
-        Converts the spot, ex a1, to two integers, ex 1 and 1.
+        Checks if the piece can move between the two square indexes, ex 0
+        for a1, on the board list. first_move is True if the piece on the
+        initial spot is a pawn that has not moved yet. A plain chess piece
+        can not move anywhere.
         """
-        # converts the letters to numbers 1-8 and splits the second number
-        self._initial_xInt = ord(initial_spot[0]) - ord('a') + 1
-        self._initial_yInt = int(initial_spot[1])
-        self._final_xInt = ord(final_spot[0]) - ord('a') + 1
-        self._final_yInt = int(final_spot[1])
+        return False
 
-    def num_to_letter(self, coord):
+    def move_candidates(self, initial_spot, board):
         """
-        Converts the x integer back to a letter for
-        any dictionary check
+        Returns the square indexes the piece could possibly move to from
+        the initial spot. Every move valid_move allows is in here, but
+        each one still has to be checked with valid_move
         """
-        return chr(ord('a') + coord - 1)
+        return range(64)
+
+    def reach(self, initial_spot, board, directions):
+        """
+        Yields the squares a sliding piece reaches in the given directions,
+        stopping at (and including) the first square with an object on it
+        """
+        for direction in directions:
+            for square in RAYS[initial_spot][direction]:
+                yield square
+                if board[square] is not None:
+                    break
+
+    def slide(self, initial_spot, final_spot, board, directions):
+        """
+        Checks if a sliding piece can get from the initial spot to the
+        final spot in one of the given directions. Goes over the squares
+        in between using the precomputed rays and returns false if any
+        of them has an object in the way.
+        """
+        direction = _DIRECTION_BETWEEN[initial_spot * 64 + final_spot]
+        if direction is None or direction not in directions:
+            return False
+        for square in RAYS[initial_spot][direction]:
+            if square == final_spot:
+                return True
+            if board[square] is not None:
+                return False
+        return False
 
 
 class Pawn(ChessPiece):
@@ -247,101 +1048,68 @@ class Pawn(ChessPiece):
     move two spots
     """
 
-    def __init__(self, color):
-        super().__init__(name='pawn', color=color)
-        self._first_move = True
+    __slots__ = ()
 
-    def valid_move(self, initial_spot, final_spot, board):
+    def __new__(cls, color):
+        return super().__new__(cls, 'pawn', color)
+
+    def move_candidates(self, initial_spot, board):
+        """
+        Returns the squares one and two spots forward and the two forward
+        diagonals that are on the board
+        """
+        if self._color == 'white':
+            step = 8
+        else:
+            step = -8
+        candidates = []
+        for final_spot in (initial_spot + step, initial_spot + 2 * step):
+            if 0 <= final_spot < 64:
+                candidates.append(final_spot)
+        forward = initial_spot + step
+        if 0 <= forward < 64:
+            if _FILE_OF[initial_spot] > 0:
+                candidates.append(forward - 1)
+            if _FILE_OF[initial_spot] < 7:
+                candidates.append(forward + 1)
+        return candidates
+
+    def valid_move(self, initial_spot, final_spot, board, first_move=False):
         """
         First check if it's the first move for this pawn, if so
-        allow for two moves up otherwise return false. Once,
-        the first move is checked, change it to false.
+        allow for two moves up otherwise return false. Whether the pawn
+        has made its first move is kept by the board and passed in.
         If the final_spot object is none, don't allow for
         diagonal movement for a pawn.
         """
-        super().valid_move(initial_spot, final_spot, board)
+        # white pieces move up the board and black pieces move down
+        if self._color == 'white':
+            step = 1
+        else:
+            step = -1
+
+        initial_x = _FILE_OF[initial_spot]
+        initial_y = _RANK_OF[initial_spot]
+        final_x = _FILE_OF[final_spot]
+        final_y = _RANK_OF[final_spot]
 
-        # moves up for white pieces
-        if board[initial_spot].get_color() == 'white':
+        if initial_x == final_x:
+            if initial_y + step == final_y and board[final_spot] is None:
+                return True
             # allows for two spot movement if the first move has not occurred
-            if self._first_move:
-                self._first_move = False
-                if self._initial_xInt == self._final_xInt:
-                    if (self._initial_yInt + 1 == self._final_yInt
-                            and board[final_spot] is None):
-                        return True
-                    elif self._initial_yInt + 2 == self._final_yInt:
-                        if (board[self.num_to_letter(self._initial_xInt) +
-                                str(self._initial_yInt + 1)] is None):
-                            if board[final_spot] is None:
-                                return True
-                            else:
-                                return False
-                        else:
-                            return False
-                    else:
-                        return False
-                else:
-                    return False
+            elif first_move and initial_y + 2 * step == final_y:
+                return (board[initial_spot + 8 * step] is None
+                        and board[final_spot] is None)
             else:
-                if self._initial_xInt == self._final_xInt:
-                    if (self._initial_yInt + 1 == self._final_yInt
-                            and board[final_spot] is None):
-                        return True
-                    else:
-                        return False
-                # check if a piece is to be captured and check for diagonal movement
-                elif board[final_spot] is not None:
-                    if (self._initial_xInt + 1 == self._final_xInt
-                            and self._initial_yInt + 1 == self._final_yInt):
-                        return True
-                    elif (self._initial_xInt - 1 == self._final_xInt
-                            and self._initial_yInt + 1 == self._final_yInt):
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
-        # if the piece is black, it can only move down
-        # same logic as white, just subtracting one/two now
+                return False
+        # a pawn can not capture on its first move
+        elif first_move:
+            return False
+        # check if a piece is to be captured and check for diagonal movement
+        elif board[final_spot] is not None:
+            return abs(initial_x - final_x) == 1 and initial_y + step == final_y
         else:
-            if self._first_move:
-                self._first_move = False
-                if self._initial_xInt == self._final_xInt:
-                    if (self._initial_yInt - 1 == self._final_yInt
-                            and board[final_spot] is None):
-                        return True
-                    elif self._initial_yInt - 2 == self._final_yInt:
-                        if (board[self.num_to_letter(self._initial_xInt) +
-                                str(self._initial_yInt - 1)] is None):
-                            if board[final_spot] is None:
-                                return True
-                            else:
-                                return False
-                        else:
-                            return False
-                    else:
-                        return False
-                else:
-                    return False
-            else:
-                if self._initial_xInt == self._final_xInt:
-                    if (self._initial_yInt - 1 == self._final_yInt
-                            and board[final_spot] is None):
-                        return True
-                    else:
-                        return False
-                elif board[final_spot] is not None:
-                    if (self._initial_xInt - 1 == self._final_xInt
-                            and self._initial_yInt - 1 == self._final_yInt):
-                        return True
-                    elif (self._initial_xInt + 1 == self._final_xInt
-                            and self._initial_yInt - 1 == self._final_yInt):
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
+            return False
 
 
 class Rook(ChessPiece):
@@ -349,78 +1117,24 @@ class Rook(ChessPiece):
     A class representing a rook. Will inherit the chess piece class.
     """
 
-    def __init__(self, color):
-        super().__init__(name='rook', color=color)
+    __slots__ = ()
+
+    def __new__(cls, color):
+        return super().__new__(cls, 'rook', color)
+
+    def move_candidates(self, initial_spot, board):
+        """
+        Returns the squares along each straight line up to the first object
+        """
+        return self.reach(initial_spot, board, ROOK_DIRECTIONS)
 
-    def valid_move(self, initial_spot, final_spot, board):
+    def valid_move(self, initial_spot, final_spot, board, first_move=False):
         """
         Check if the rook is completing a valid move based on if either the
         x axis or y axis is not changing between the final and initial spot.
-        Constantly checks if an object is in front of it as it moves to
-        its final spot.
-        """
-        super().valid_move(initial_spot, final_spot, board)
-
-        # check if the x axis stays the same
-        if self._initial_xInt == self._final_xInt:
-            # check if the object is moving right
-            if self._final_yInt > self._initial_yInt:
-                while self._initial_yInt != self._final_yInt:
-                    # check if an object is present in the next spot
-                    # if so, return true only if it's the final spot
-                    if (board[self.num_to_letter(self._initial_xInt) + str(self._initial_yInt + 1)]
-                            is not None):
-                        if (final_spot ==
-                                self.num_to_letter(self._initial_xInt) + str(self._initial_yInt + 1)):
-                            return True
-                        else:
-                            return False
-                    else:
-                        self._initial_yInt += 1
-                return True
-            # check if the object is moving left
-            if self._final_yInt < self._initial_yInt:
-                while self._initial_yInt != self._final_yInt:
-                    if (board[self.num_to_letter(self._initial_xInt) + str(self._initial_yInt - 1)]
-                            is not None):
-                        if (final_spot ==
-                                self.num_to_letter(self._initial_xInt) + str(self._initial_yInt - 1)):
-                            return True
-                        else:
-                            return False
-                    else:
-                        self._initial_yInt -= 1
-                return True
-        # check if the y axis stays the same
-        # same logic as the x axis, just updating the y int now
-        elif self._initial_yInt == self._final_yInt:
-            if self._final_xInt > self._initial_xInt:
-                while self._initial_xInt != self._final_xInt:
-                    if (board[self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt)]
-                            is not None):
-                        if (final_spot ==
-                                self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt)):
-                            return True
-                        else:
-                            return False
-                    else:
-                        self._initial_xInt += 1
-                return True
-            if self._final_xInt < self._initial_xInt:
-                while self._initial_xInt != self._final_xInt:
-                    if (board[self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt)]
-                            is not None):
-                        if (final_spot ==
-                                self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt)):
-                            return True
-                        else:
-                            return False
-                    else:
-                        self._initial_xInt -= 1
-                return True
-        # if both the x and y are changing, then it is not a valid move for a rook
-        else:
-            return False
+        Checks if an object is in front of it along the way to its final spot.
+        """
+        return self.slide(initial_spot, final_spot, board, ROOK_DIRECTIONS)
 
 
 class Knight(ChessPiece):
@@ -428,44 +1142,24 @@ class Knight(ChessPiece):
     A class representing a knight. Will inherit the chess piece class.
     """
 
-    def __init__(self, color):
-        super().__init__(name='knight', color=color)
-
-    def valid_move(self, initial_spot, final_spot, board):
-        """
-        Check if the knight is doing a legal move by checking how much each
-        grid value increases by. Ex. If letter increases by 2, num increases by
-        1.
-        """
-        super().valid_move(initial_spot, final_spot, board)
-
-        # checks every scenario a knight can move
-        if (self._initial_xInt + 2 == self._final_xInt and
-                self._initial_yInt + 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt + 2 == self._final_xInt and
-                self._initial_yInt - 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt - 2 == self._final_xInt and
-                self._initial_yInt + 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt - 2 == self._final_xInt and
-                self._initial_yInt - 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt + 1 == self._final_xInt and
-                self._initial_yInt + 2 == self._final_yInt):
-            return True
-        elif (self._initial_xInt + 1 == self._final_xInt and
-                self._initial_yInt - 2 == self._final_yInt):
-            return True
-        elif (self._initial_xInt - 1 == self._final_xInt and
-                self._initial_yInt + 2 == self._final_yInt):
-            return True
-        elif (self._initial_xInt - 1 == self._final_xInt and
-                self._initial_yInt - 2 == self._final_yInt):
-            return True
-        else:
-            return False
+    __slots__ = ()
+
+    def __new__(cls, color):
+        return super().__new__(cls, 'knight', color)
+
+    def move_candidates(self, initial_spot, board):
+        """
+        Returns the squares a knight can jump to from the initial spot
+        """
+        return KNIGHT_TARGETS[initial_spot]
+
+    def valid_move(self, initial_spot, final_spot, board, first_move=False):
+        """
+        Check if the knight is doing a legal move by checking if the final
+        spot is one of the squares a knight can jump to from the initial spot.
+        Ex. If letter increases by 2, num increases by 1.
+        """
+        return final_spot in KNIGHT_TARGETS[initial_spot]
 
 
 class Bishop(ChessPiece):
@@ -473,101 +1167,24 @@ class Bishop(ChessPiece):
     A class representing a bishop. Will inherit the chess piece class.
     """
 
-    def __init__(self, color):
-        super().__init__(name='bishop', color=color)
+    __slots__ = ()
+
+    def __new__(cls, color):
+        return super().__new__(cls, 'bishop', color)
+
+    def move_candidates(self, initial_spot, board):
+        """
+        Returns the squares along each diagonal up to the first object
+        """
+        return self.reach(initial_spot, board, BISHOP_DIRECTIONS)
 
-    def valid_move(self, initial_spot, final_spot, board):
+    def valid_move(self, initial_spot, final_spot, board, first_move=False):
         """
         Check if the bishop is doing a valid move by seeing if it
-        is going diagonal in either direction by seeing if each
-        increments by 1 or decreases by 1. Constantly checks if
-        an object is in front of it as it moves to its final spot.
-        """
-        super().valid_move(initial_spot, final_spot, board)
-        # checks for if the piece is going up and to the right
-        # same logic for each other direction
-        if (self._initial_xInt < self._final_xInt and
-                self._initial_yInt < self._final_yInt):
-            while (self._initial_xInt != self._final_xInt and
-                    self._initial_yInt != self._final_yInt):
-                # similar to rook, check if there is an object in front of it
-                # as it moves, if not the final spot, return false
-                if (board[self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt + 1)]
-                        is not None):
-                    if (final_spot ==
-                            self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt + 1)):
-                        return True
-                    else:
-                        return False
-                # if the final spot is completely diagonal, return true
-                elif (final_spot ==
-                            self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt + 1)):
-                    return True
-                else:
-                    self._initial_xInt += 1
-                    self._initial_yInt += 1
-            # returns false if it gets past the final spot meaning it was not diagonal
-            return False
-        # checks if the piece is going up and to the left
-        elif (self._initial_xInt > self._final_xInt and
-                self._initial_yInt < self._final_yInt):
-            while (self._initial_xInt != self._final_xInt and
-                    self._initial_yInt != self._final_yInt):
-                if (board[self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt + 1)]
-                        is not None):
-                    if (final_spot ==
-                            self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt + 1)):
-                        return True
-                    else:
-                        return False
-                elif (final_spot ==
-                            self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt + 1)):
-                    return True
-                else:
-                    self._initial_xInt -= 1
-                    self._initial_yInt += 1
-            return False
-        # checks if the piece is going down and to the right
-        elif (self._initial_xInt < self._final_xInt and
-                self._initial_yInt > self._final_yInt):
-            while (self._initial_xInt != self._final_xInt and
-                    self._initial_yInt != self._final_yInt):
-                if (board[self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt - 1)]
-                        is not None):
-                    if (final_spot ==
-                            self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt - 1)):
-                        return True
-                    else:
-                        return False
-                elif (final_spot ==
-                            self.num_to_letter(self._initial_xInt + 1) + str(self._initial_yInt - 1)):
-                    return True
-                else:
-                    self._initial_xInt += 1
-                    self._initial_yInt -= 1
-            return False
-        # checks if the piece is going down and to the left
-        elif (self._initial_xInt > self._final_xInt and
-                self._initial_yInt > self._final_yInt):
-            while (self._initial_xInt != self._final_xInt and
-                    self._initial_yInt != self._final_yInt):
-                if (board[self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt - 1)]
-                        is not None):
-                    if (final_spot ==
-                            self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt - 1)):
-                        return True
-                    else:
-                        return False
-                elif (final_spot ==
-                            self.num_to_letter(self._initial_xInt - 1) + str(self._initial_yInt - 1)):
-                    return True
-                else:
-                    self._initial_xInt -= 1
-                    self._initial_yInt -= 1
-            return False
-        # if it is not doing any of these then it is not valid for a bishop
-        else:
-            return False
+        is going diagonal in either direction. Checks if an object is
+        in front of it along the way to its final spot.
+        """
+        return self.slide(initial_spot, final_spot, board, BISHOP_DIRECTIONS)
 
 
 class Queen(ChessPiece):
@@ -575,24 +1192,24 @@ class Queen(ChessPiece):
     A class representing a queen. Will inherit the chess piece class.
     """
 
-    def __init__(self, color):
-        super().__init__(name='queen', color=color)
+    __slots__ = ()
+
+    def __new__(cls, color):
+        return super().__new__(cls, 'queen', color)
 
-    def valid_move(self, initial_spot, final_spot, board):
+    def move_candidates(self, initial_spot, board):
         """
-        Check if the queen is doing a valid move by going diagonal
-        or going forward by inheriting the move check methods of bishop
-        and rook. If either return true, then the method returns true.
+        Returns the squares along every line up to the first object
         """
-        # creates two objects for a rook and bishop and uses their valid move checks
-        check_rook = Rook(self._color)
-        check_bishop = Bishop(self._color)
+        return self.reach(initial_spot, board, QUEEN_DIRECTIONS)
 
-        if (check_rook.valid_move(initial_spot, final_spot, board) or
-                check_bishop.valid_move(initial_spot, final_spot, board)):
-            return True
-        else:
-            return False
+    def valid_move(self, initial_spot, final_spot, board, first_move=False):
+        """
+        Check if the queen is doing a valid move by going diagonal
+        or going forward, which are the directions of the bishop and
+        rook together.
+        """
+        return self.slide(initial_spot, final_spot, board, QUEEN_DIRECTIONS)
 
 
 class King(ChessPiece):
@@ -600,40 +1217,62 @@ class King(ChessPiece):
     A class representing a king. Will inherit the chess piece class.
     """
 
-    def __init__(self, color):
-        super().__init__(name='king', color=color)
+    __slots__ = ()
 
-    def valid_move(self, initial_spot, final_spot, board):
+    def __new__(cls, color):
+        return super().__new__(cls, 'king', color)
+
+    def move_candidates(self, initial_spot, board):
+        """
+        Returns the squares next to the initial spot
+        """
+        return KING_TARGETS[initial_spot]
+
+    def valid_move(self, initial_spot, final_spot, board, first_move=False):
         """
         Check if the king is doing valid move by checking if a king
         is moving within one spot of its initial spot.
         """
-        super().valid_move(initial_spot, final_spot, board)
-
-        # checks every valid move for a king, otherwise returns false
-        if (self._initial_xInt - 1 == self._final_xInt and
-                self._initial_yInt == self._final_yInt):
-            return True
-        elif (self._initial_xInt - 1 == self._final_xInt and
-                self._initial_yInt + 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt == self._final_xInt and
-                self._initial_yInt + 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt + 1 == self._final_xInt and
-                self._initial_yInt + 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt + 1 == self._final_xInt and
-                self._initial_yInt == self._final_yInt):
-            return True
-        elif (self._initial_xInt + 1 == self._final_xInt and
-                self._initial_yInt - 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt == self._final_xInt and
-                self._initial_yInt - 1 == self._final_yInt):
-            return True
-        elif (self._initial_xInt - 1 == self._final_xInt and
-                self._initial_yInt - 1 == self._final_yInt):
-            return True
-        else:
-            return False
+        return final_spot in KING_TARGETS[initial_spot]
+
+
+# the piece class for each name in PIECE_NAMES order
+PIECE_CLASSES = (Pawn, Rook, Knight, Bishop, Queen, King)
+
+# the shared piece object for each piece index from get_index
+PIECES = tuple(piece_class(color) for color in COLORS for piece_class in PIECE_CLASSES)
+
+
+def _build_starting_board():
+    """
+    Builds the board list every game starts from and the mask of the
+    pawns on it that have not made their first move
+    """
+    board = [None] * 64
+    first_moves = 0
+
+    # fill the 2 and 7th row with pawns
+    for x in FILES:
+        board[SQUARE_INDEX[x + '2']] = Pawn('white')
+        board[SQUARE_INDEX[x + '7']] = Pawn('black')
+        first_moves |= 1 << SQUARE_INDEX[x + '2'] | 1 << SQUARE_INDEX[x + '7']
+
+    # initialize the rest of the pieces
+    back_row = (Rook, Knight, Bishop, Queen, King, Bishop, Knight, Rook)
+    for x, piece_class in zip(FILES, back_row):
+        board[SQUARE_INDEX[x + '1']] = piece_class('white')
+        board[SQUARE_INDEX[x + '8']] = piece_class('black')
+    return tuple(board), first_moves
+
+
+_STARTING_BOARD, _STARTING_FIRST_MOVES = _build_starting_board()
+_STARTING_HASH = zobrist_hash(_STARTING_BOARD, 'white', _STARTING_FIRST_MOVES)
+
+
+def starting_hash(turn):
+    """
+    Returns the hash of the starting board with the side to move
+    """
+    if turn == 'black':
+        return _STARTING_HASH ^ ZOBRIST_BLACK_KEY
+    return _STARTING_HASH
@@ -0,0 +1,325 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: A batch engine that checks and makes moves for many ChessVar
+#                games at once with NumPy. N boards are kept as an (N, 64) int8
+#                array using the to_bytes square codes (0 for empty, the piece
+#                index plus one otherwise), with arrays for the side to move,
+#                the pawns that still have their first move, the piece counts
+#                and the game state. validate and apply take one move per board
+#                and work on the whole batch in a few array operations, and the
+#                win check matches ChessVar.update_game_state. NumPy is only
+#                needed by this file, the rest of the game does not use it.
+#
+#                Usage: python batch.py [--boards 1000] [--plies 100]
+#                                       [--seed 0] [--check]
+
+import argparse
+import random
+import sys
+import time
+
+import numpy as np
+
+from ChessVar import (ChessVar, GAME_STATES, PIECE_NAMES, SQUARE_NAMES, RAYS,
+                      KNIGHT_TARGETS, KING_TARGETS, ROOK_DIRECTIONS, BISHOP_DIRECTIONS)
+
+# number codes for the side to move and the game state, the same order as
+# COLORS and GAME_STATES
+WHITE = 0
+BLACK = 1
+UNFINISHED = 0
+WHITE_WON = 1
+BLACK_WON = 2
+
+# piece type numbers in PIECE_NAMES order
+_PAWN, _ROOK, _KNIGHT, _BISHOP, _QUEEN, _KING = range(len(PIECE_NAMES))
+
+
+def _build_tables():
+    """
+    Builds the (64, 64) lookup tables used to check a move from one square
+    to another: knight jumps, king steps, the direction of the line between
+    the squares (-1 if there is none) and a (64, 64, 64) table of the
+    squares in between
+    """
+    knight = np.zeros((64, 64), dtype=bool)
+    king = np.zeros((64, 64), dtype=bool)
+    direction = np.full((64, 64), -1, dtype=np.int8)
+    between = np.zeros((64, 64, 64), dtype=bool)
+    for initial in range(64):
+        knight[initial, list(KNIGHT_TARGETS[initial])] = True
+        king[initial, list(KING_TARGETS[initial])] = True
+        for number, ray in enumerate(RAYS[initial]):
+            for distance, final in enumerate(ray):
+                direction[initial, final] = number
+                between[initial, final, list(ray[:distance])] = True
+    return knight, king, direction, between
+
+
+_KNIGHT_MOVES, _KING_MOVES, _DIRECTION, _BETWEEN = _build_tables()
+_ROOK_LINE = np.isin(_DIRECTION, ROOK_DIRECTIONS)
+_BISHOP_LINE = np.isin(_DIRECTION, BISHOP_DIRECTIONS)
+_FILE = np.arange(64) % 8
+_RANK = np.arange(64) // 8
+
+
+class BatchBoards:
+    """
+    Class holding a batch of boards that all take a move at the same time.
+    Boards are numbered from 0 to N - 1.
+    """
+
+    def __init__(self, count):
+        """
+        Makes count boards set up at the starting position
+        """
+        self._set_from_bytes([ChessVar().to_bytes()] * count)
+
+    @classmethod
+    def from_games(cls, games):
+        """
+        Returns a batch holding the positions of a list of ChessVar games
+        """
+        batch = cls.__new__(cls)
+        batch._set_from_bytes([game.to_bytes() for game in games])
+        return batch
+
+    def _set_from_bytes(self, packed):
+        """
+        Fills in the arrays from a list of positions from to_bytes
+        """
+        count = len(packed)
+        data = np.frombuffer(b''.join(packed), dtype=np.uint8).reshape(count, 33)
+        codes = np.empty((count, 64), dtype=np.uint8)
+        codes[:, 0::2] = data[:, :32] & 15
+        codes[:, 1::2] = data[:, :32] >> 4
+
+        # codes 13 and 14 are pawns that have not made their first move
+        self._first_moves = codes > 12
+        codes[codes == 13] = 1
+        codes[codes == 14] = 7
+        self._boards = codes.astype(np.int8)
+        self._turns = (data[:, 32] & 1).astype(np.int8)
+        self._states = (data[:, 32] >> 1).astype(np.int8)
+        # the count of each piece index, ex column 0 is white pawns
+        self._counts = np.stack([(self._boards == index + 1).sum(axis=1)
+                                 for index in range(12)], axis=1).astype(np.int16)
+
+    def __len__(self):
+        return len(self._boards)
+
+    def get_boards(self):
+        """
+        Returns the (N, 64) array of square codes
+        """
+        return self._boards
+
+    def get_turns(self):
+        """
+        Returns the array of sides to move, 0 for white and 1 for black
+        """
+        return self._turns
+
+    def get_states(self):
+        """
+        Returns the array of game states as indexes into GAME_STATES
+        """
+        return self._states
+
+    def get_first_moves(self):
+        """
+        Returns the (N, 64) array that is True where a pawn has not made
+        its first move
+        """
+        return self._first_moves
+
+    def get_counts(self):
+        """
+        Returns the (N, 12) array of how many of each piece index are left
+        """
+        return self._counts
+
+    def to_game(self, number):
+        """
+        Returns a new ChessVar set to the position of one board
+        """
+        codes = self._boards[number].astype(np.uint8)
+        first_moves = self._first_moves[number]
+        codes = np.where(first_moves & (codes == 1), 13, codes)
+        codes = np.where(first_moves & (codes == 7), 14, codes).astype(np.uint8)
+        packed = bytearray((codes[0::2] | codes[1::2] << 4).tobytes())
+        packed.append(int(self._turns[number]) | int(self._states[number]) << 1)
+        return ChessVar.from_bytes(bytes(packed))
+
+    def validate(self, initial, final):
+        """
+        Checks one move per board, given as arrays of initial and final
+        square indexes, with the same rules as make_move. Returns a bool
+        array that is True for each board where the move is legal. Indexes
+        outside 0 to 63 are out of bounds and never legal
+        """
+        initial = np.asarray(initial, dtype=np.int64)
+        final = np.asarray(final, dtype=np.int64)
+        rows = np.arange(len(self._boards))
+        legal = ((self._states == UNFINISHED) & (initial >= 0) & (initial < 64)
+                 & (final >= 0) & (final < 64))
+        # squares that are out of bounds are looked up as 0 and then ignored
+        initial = np.where(legal, initial, 0)
+        final = np.where(legal, final, 0)
+
+        piece = self._boards[rows, initial].astype(np.int16)
+        target = self._boards[rows, final].astype(np.int16)
+        color = (piece - 1) // 6
+        legal &= (piece != 0) & (color == self._turns)
+        legal &= (target == 0) | ((target - 1) // 6 != color)
+        kind = (piece - 1) % 6
+
+        # sliding pieces need a line between the squares with nothing on it
+        blocked = (_BETWEEN[initial, final] & (self._boards != 0)).any(axis=1)
+        rook_line = _ROOK_LINE[initial, final] & ~blocked
+        bishop_line = _BISHOP_LINE[initial, final] & ~blocked
+
+        # white pawns go up a rank and black pawns go down
+        step = np.where(color == WHITE, 1, -1)
+        first_move = self._first_moves[rows, initial]
+        same_file = _FILE[initial] == _FILE[final]
+        rank_change = _RANK[final] - _RANK[initial]
+        empty_target = target == 0
+        passed = self._boards[rows, np.clip(initial + 8 * step, 0, 63)] == 0
+        pawn = np.where(
+            same_file,
+            ((rank_change == step) & empty_target)
+            | (first_move & (rank_change == 2 * step) & passed & empty_target),
+            # a pawn can not capture on its first move
+            ~first_move & ~empty_target & (np.abs(_FILE[initial] - _FILE[final]) == 1)
+            & (rank_change == step))
+
+        geometry = np.select(
+            [kind == _PAWN, kind == _ROOK, kind == _KNIGHT, kind == _BISHOP,
+             kind == _QUEEN, kind == _KING],
+            [pawn, rook_line, _KNIGHT_MOVES[initial, final], bishop_line,
+             rook_line | bishop_line, _KING_MOVES[initial, final]],
+            default=False)
+        return legal & geometry
+
+    def apply(self, initial, final, legal=None):
+        """
+        Makes one move per board where it is legal and returns the bool
+        array of the boards that moved. If legal is given it is used as
+        the boards to move instead of checking the moves again
+        """
+        if legal is None:
+            legal = self.validate(initial, final)
+        rows = np.flatnonzero(legal)
+        if len(rows) == 0:
+            return legal
+        initial = np.asarray(initial, dtype=np.int64)[rows]
+        final = np.asarray(final, dtype=np.int64)[rows]
+
+        captured = self._boards[rows, final].astype(np.int64)
+        self._boards[rows, final] = self._boards[rows, initial]
+        self._boards[rows, initial] = 0
+        # a pawn loses its first move by moving or by being captured
+        self._first_moves[rows, initial] = False
+        self._first_moves[rows, final] = False
+        self._turns[rows] ^= 1
+
+        took = captured != 0
+        self._counts[rows[took], captured[took] - 1] -= 1
+        self.update_game_states(rows)
+        return legal
+
+    def update_game_states(self, rows=None):
+        """
+        Checks if the games on the given boards (all of them if none are
+        given) are over, going through the piece types in the same order
+        as ChessVar.update_game_state so the same side wins
+        """
+        if rows is None:
+            rows = np.arange(len(self._boards))
+        counts = self._counts[rows]
+        states = self._states[rows]
+        for kind in range(len(PIECE_NAMES)):
+            states = np.where(counts[:, kind] == 0, BLACK_WON, states)
+            states = np.where(counts[:, kind + 6] == 0, WHITE_WON, states)
+        self._states[rows] = states
+
+
+def compare_with_scalar(boards=1000, plies=100, seed=0):
+    """
+    Plays random games on both a batch and a list of ChessVar games and
+    checks every answer is the same. Each ply every board is given either
+    a legal move or a random pair of squares (some out of bounds). Returns
+    the number of moves checked, or raises AssertionError at the first
+    difference
+    """
+    rng = random.Random(seed)
+    games = [ChessVar() for _ in range(boards)]
+    batch = BatchBoards(boards)
+    checked = 0
+    for _ in range(plies):
+        initial = []
+        final = []
+        for game in games:
+            moves = list(game.generate_moves())
+            if moves and rng.random() < 0.6:
+                move = rng.choice(moves)
+            else:
+                move = (rng.randrange(-2, 66), rng.randrange(-2, 66))
+            initial.append(move[0])
+            final.append(move[1])
+
+        moved = batch.apply(initial, final)
+        for number, game in enumerate(games):
+            legal = (0 <= initial[number] < 64 and 0 <= final[number] < 64
+                     and game.find_move(SQUARE_NAMES[initial[number]],
+                                        SQUARE_NAMES[final[number]]) is not None)
+            assert legal == bool(moved[number]), 'board %d differs on a move' % number
+            if legal:
+                game.apply_move(initial[number], final[number])
+            assert GAME_STATES[batch.get_states()[number]] == game.get_game_state(), \
+                'board %d has a different game state' % number
+            checked += 1
+
+    for number, game in enumerate(games):
+        assert batch.to_game(number).to_fen() == game.to_fen(), 'board %d differs' % number
+    return checked
+
+
+def main(argv=None):
+    """
+    Times random moves over a batch of boards, or with --check compares
+    the batch with ChessVar
+    """
+    parser = argparse.ArgumentParser(description='Make moves on many ChessVar boards at once.')
+    parser.add_argument('--boards', type=int, default=1000)
+    parser.add_argument('--plies', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', action='store_true',
+                        help='compare every answer with the ChessVar rules')
+    args = parser.parse_args(argv)
+
+    if args.check:
+        checked = compare_with_scalar(args.boards, args.plies, args.seed)
+        print('%d moves checked, all the same as ChessVar' % checked)
+        return 0
+
+    generator = np.random.default_rng(args.seed)
+    batch = BatchBoards(args.boards)
+    tried = 0
+    made = 0
+    start = time.perf_counter()
+    for _ in range(args.plies):
+        initial = generator.integers(0, 64, args.boards)
+        final = generator.integers(0, 64, args.boards)
+        made += int(batch.apply(initial, final).sum())
+        tried += args.boards
+    seconds = time.perf_counter() - start
+    print('%d moves tried, %d made in %.2fs (%.0f moves tried/sec)'
+          % (tried, made, seconds, tried / seconds if seconds > 0 else 0.0))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
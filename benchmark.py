@@ -0,0 +1,379 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: Repeatable benchmarks for ChessVar. Times making a new game,
+#                initialize_board, make_move for moves it makes and moves it
+#                turns down, make_move for the longest sliding moves, and each
+#                piece type's valid_move (the bitboards' valid_move for the
+#                bitboard engine), and measures how many bytes a game
+#                takes with tracemalloc. The moves come from random legal games
+#                played with a fixed seed, so every run does the same work.
+#                Each timing is the best of a few repeats, given in seconds per
+#                call. Results are written as JSON and can be compared against
+#                a saved baseline, failing if any number got worse by more than
+#                the threshold.
+#
+#                Usage: python benchmark.py [--seed 0] [--quick] [--engine bitboard]
+#                                           [--only NAME ...] [--output results.json]
+#                                           [--check] [--update] [--threshold 0.25]
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from ChessVar import ChessVar, PIECE_NAMES, SQUARE_NAMES
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# how much worse than the baseline a number can get before --check fails
+DEFAULT_THRESHOLD = 0.25
+
+# a position with every piece type on the board and open lines for the
+# rook (a1 to a8), bishop (h1 to a8) and queen (d1 to d7)
+LONG_SLIDE_FEN = '1nbqk2r/6p1/8/8/8/8/4P3/R2QK1NB w e2g7 UNFINISHED'
+LONG_SLIDES = (('a1', 'a8'), ('h1', 'a8'), ('d1', 'd7'))
+
+# moves make_move turns down from the starting board, one for each reason
+REJECTED_MOVES = (('a2', 'a5'), ('a7', 'a6'), ('a1', 'a2'), ('a3', 'a4'), ('z9', 'a1'))
+
+
+def random_games(count, plies, seed):
+    """
+    Returns count lists of moves, each a random legal game of up to plies
+    moves from the starting board written as pairs of spots
+    """
+    rng = random.Random(seed)
+    games = []
+    for _ in range(count):
+        game = ChessVar()
+        moves = []
+        for _ in range(plies):
+            legal = list(game.generate_moves())
+            if not legal:
+                break
+            initial, final = rng.choice(legal)
+            moves.append((SQUARE_NAMES[initial], SQUARE_NAMES[final]))
+            game.apply_move(initial, final)
+        games.append(moves)
+    return games
+
+
+def time_per_call(run, calls, repeat):
+    """
+    Runs the function repeat times, with the garbage collector off, and
+    returns the best time in seconds divided by the number of calls it makes
+    """
+    best = None
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            seconds = time.perf_counter() - start
+            if best is None or seconds < best:
+                best = seconds
+    finally:
+        if enabled:
+            gc.enable()
+    return best / calls
+
+
+def bench_construct(settings):
+    """
+    Times making a new game
+    """
+    count = settings['calls']
+    engine = settings['engine']
+
+    def run():
+        for _ in range(count):
+            ChessVar(engine=engine)
+    return {'construct_seconds': time_per_call(run, count, settings['repeat'])}
+
+
+def bench_initialize_board(settings):
+    """
+    Times initialize_board on a game that already exists
+    """
+    count = settings['calls']
+    game = ChessVar(engine=settings['engine'])
+
+    def run():
+        for _ in range(count):
+            game.initialize_board()
+    return {'initialize_board_seconds': time_per_call(run, count, settings['repeat'])}
+
+
+def bench_make_move(settings):
+    """
+    Times make_move replaying the random games on new games made before
+    the timing starts, and make_move turning down bad moves
+    """
+    games = random_games(settings['games'], settings['plies'], settings['seed'])
+    moves = sum(len(game) for game in games)
+    engine = settings['engine']
+    boards = []
+
+    def setup():
+        boards[:] = [ChessVar(engine=engine) for _ in games]
+
+    def run():
+        for board, game in zip(boards, games):
+            make_move = board.make_move
+            for initial, final in game:
+                make_move(initial, final)
+
+    best = None
+    for _ in range(settings['repeat']):
+        setup()
+        seconds = time_per_call(run, moves, 1)
+        if best is None or seconds < best:
+            best = seconds
+
+    game = ChessVar(engine=engine)
+    count = settings['calls'] // len(REJECTED_MOVES)
+
+    def run_rejected():
+        make_move = game.make_move
+        for _ in range(count):
+            for initial, final in REJECTED_MOVES:
+                make_move(initial, final)
+    rejected = time_per_call(run_rejected, count * len(REJECTED_MOVES), settings['repeat'])
+    return {'make_move_accepted_seconds': best, 'make_move_rejected_seconds': rejected}
+
+
+def bench_long_slides(settings):
+    """
+    Times make_move for the longest sliding moves, each made on its own
+    copy of the position made before the timing starts
+    """
+    engine = settings['engine']
+    position = ChessVar.from_fen(LONG_SLIDE_FEN, engine)
+    packed = position.to_bytes()
+    count = settings['calls'] // len(LONG_SLIDES)
+    for initial, final in LONG_SLIDES:
+        if position.find_move(initial, final) is None:
+            raise ValueError('long slide %s%s is not legal' % (initial, final))
+    positions = []
+
+    def run():
+        for copies in positions:
+            for (initial, final), game in zip(LONG_SLIDES, copies):
+                game.make_move(initial, final)
+
+    best = None
+    for _ in range(settings['repeat']):
+        positions[:] = [[ChessVar.from_bytes(packed, engine) for _ in LONG_SLIDES]
+                        for _ in range(count)]
+        seconds = time_per_call(run, count * len(LONG_SLIDES), 1)
+        if best is None or seconds < best:
+            best = seconds
+    return {'make_move_long_slide_seconds': best}
+
+
+def bench_valid_move(settings):
+    """
+    Times each piece type's valid_move on every square of the board from
+    the positions reached in the random games, so both legal and illegal
+    moves are checked. With the bitboard engine the game's
+    Bitboards.valid_move is timed instead of the piece objects'
+    """
+    bitboard = settings['engine'] == 'bitboard'
+    checks = {name: [] for name in PIECE_NAMES}
+    for moves in random_games(settings['games'] // 4 or 1, settings['plies'], settings['seed']):
+        game = ChessVar(engine=settings['engine'])
+        for initial, final in moves:
+            board = [game.piece_at(square) for square in range(64)]
+            first_moves = game.get_first_moves()
+            # a copy of the game's bitboards, which change as moves are made
+            bitboards = game.get_bitboards().copy() if bitboard else None
+            for square, piece in enumerate(board):
+                if piece is not None and piece.get_color() == game.get_turn():
+                    if bitboard:
+                        checks[piece.get_name()].extend(
+                            (bitboards, piece.get_index(), square, target, first_moves)
+                            for target in range(64))
+                    else:
+                        first_move = first_moves >> square & 1 == 1
+                        checks[piece.get_name()].extend(
+                            (piece, square, target, board, first_move) for target in range(64))
+            game.make_move(initial, final)
+
+    results = {}
+    for name, calls in checks.items():
+        calls = calls[:settings['calls']]
+
+        if bitboard:
+            def run():
+                for bitboards, index, initial, final, first_moves in calls:
+                    bitboards.valid_move(index, initial, final, first_moves)
+        else:
+            def run():
+                for piece, initial, final, board, first_move in calls:
+                    piece.valid_move(initial, final, board, first_move)
+        results['valid_move_%s_seconds' % name] = time_per_call(run, len(calls), settings['repeat'])
+    return results
+
+
+def bench_memory(settings):
+    """
+    Measures the bytes taken by a new game and by a game after the plies
+    of a random game, as the memory tracemalloc sees held by many games
+    divided by the number of games
+    """
+    count = settings['games']
+    engine = settings['engine']
+    games = random_games(count, settings['plies'], settings['seed'])
+    results = {}
+    for name, played in (('game_bytes_new', False), ('game_bytes_played', True)):
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            boards = []
+            for moves in games:
+                board = ChessVar(engine=engine)
+                if played:
+                    for initial, final in moves:
+                        board.make_move(initial, final)
+                boards.append(board)
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        results[name] = (after - before) / count
+        del boards
+    return results
+
+
+BENCHMARKS = {
+    'construct': bench_construct,
+    'initialize_board': bench_initialize_board,
+    'make_move': bench_make_move,
+    'long_slides': bench_long_slides,
+    'valid_move': bench_valid_move,
+    'memory': bench_memory,
+}
+
+
+def run_benchmarks(names=None, seed=0, quick=False, engine='mailbox'):
+    """
+    Runs the named benchmarks (default all) and returns the results as a
+    dictionary with the settings used and every number, all of which are
+    better when lower
+    """
+    settings = {'seed': seed, 'engine': engine,
+                'calls': 2000 if quick else 20000,
+                'games': 20 if quick else 200,
+                'plies': 40,
+                'repeat': 3 if quick else 5}
+    metrics = {}
+    for name in names or BENCHMARKS:
+        metrics.update(BENCHMARKS[name](settings))
+    return {'python': platform.python_version(),
+            'settings': settings,
+            'metrics': metrics}
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Returns a list of (name, baseline value, new value, change) for every
+    number in both results that got worse by more than the threshold, where
+    change is the new value over the baseline minus one. Raises ValueError
+    if the baseline was run with different settings, ex another engine or
+    --quick, since its numbers can not be compared
+    """
+    if baseline.get('settings') != results['settings']:
+        raise ValueError('the baseline was run with settings %s, not %s'
+                         % (baseline.get('settings'), results['settings']))
+    regressions = []
+    old = baseline.get('metrics', {})
+    for name, value in sorted(results['metrics'].items()):
+        if name in old and old[name] > 0:
+            change = value / old[name] - 1
+            if change > threshold:
+                regressions.append((name, old[name], value, change))
+    return regressions
+
+
+def format_value(name, value):
+    """
+    Writes a number for printing, in microseconds for times
+    """
+    if name.endswith('_seconds'):
+        return '%.3f us' % (value * 1e6)
+    return '%.0f bytes' % value
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks from the command line, prints every number and its
+    change from the baseline, and returns 1 if --check finds a regression
+    """
+    parser = argparse.ArgumentParser(description='Benchmark ChessVar.')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--quick', action='store_true', help='fewer calls and games')
+    parser.add_argument('--engine', choices=('mailbox', 'bitboard'), default='mailbox')
+    parser.add_argument('--only', choices=sorted(BENCHMARKS), action='append',
+                        help='benchmark to run, can be given more than once (default all)')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--check', action='store_true',
+                        help='fail if a number is worse than the baseline by more than the threshold')
+    parser.add_argument('--update', action='store_true', help='save the results as the baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown as a fraction, ex 0.25 for 25%%')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.seed, args.quick, args.engine)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    # a baseline run with other settings is not shown next to the numbers
+    comparable = baseline.get('settings') == results['settings']
+    old = baseline.get('metrics', {}) if comparable else {}
+    for name, value in sorted(results['metrics'].items()):
+        line = '%-32s %14s' % (name, format_value(name, value))
+        if old.get(name):
+            line += '  %+6.1f%%' % ((value / old[name] - 1) * 100)
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+            output_file.write('\n')
+
+    failed = False
+    if args.check:
+        if not baseline:
+            print('no baseline at %s, run with --update to save one' % args.baseline)
+            failed = True
+        elif not comparable:
+            print('can not compare, %s was saved with settings %s but this run used %s'
+                  % (args.baseline, json.dumps(baseline.get('settings'), sort_keys=True),
+                     json.dumps(results['settings'], sort_keys=True)))
+            failed = True
+        else:
+            for name, before, after, change in compare(results, baseline, args.threshold):
+                print('REGRESSION %s: %s -> %s (%+.1f%%)'
+                      % (name, format_value(name, before), format_value(name, after), change * 100))
+                failed = True
+
+    if args.update:
+        with open(args.baseline, 'w') as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
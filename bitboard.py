@@ -0,0 +1,709 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: A bitboard version of the board, used by BitboardGame, the
+#                game ChessVar makes when it is created with engine="bitboard".
+#                Every color and piece type pair is kept as one 64 bit integer
+#                where bit n is set if that piece is on square n (the same 0-63
+#                indexes used by ChessVar), and the game keeps no board list.
+#                Occupancy, attacks and move checks are answered with bit
+#                operations instead of looking at piece objects. A game is
+#                about 40% smaller than the default engine, but in Python the
+#                bit operations cost more than looking at a list, so moves are
+#                about twice as slow. Also holds AttackMaps, used by both engines.
+
+import time
+
+from ChessVar import (ChessVar, COLORS, PIECE_NAMES, PIECES, RAYS, KNIGHT_TARGETS, KING_TARGETS,
+                      ROOK_DIRECTIONS, BISHOP_DIRECTIONS, QUEEN_DIRECTIONS, SQUARE_INDEX,
+                      SQUARE_NAMES, moved_hash, starting_hash, zobrist_hash,
+                      _STARTING_BOARD, _STARTING_FIRST_MOVES)
+
+# the number of piece types, a piece index is color * _TYPES + piece type
+_TYPES = len(PIECE_NAMES)
+_COLOR_INDEXES = (tuple(range(_TYPES)), tuple(range(_TYPES, 2 * _TYPES)))
+
+# the directions that go towards higher square indexes, every other
+# direction goes towards lower indexes
+_POSITIVE_DIRECTIONS = frozenset((0, 2, 4, 5))
+
+
+def _mask(squares):
+    """
+    Turns a group of square indexes into a bitboard
+    """
+    result = 0
+    for square in squares:
+        result |= 1 << square
+    return result
+
+
+_RAY_MASKS = tuple(tuple(_mask(ray) for ray in RAYS[index]) for index in range(64))
+_KNIGHT_MASKS = tuple(_mask(targets) for targets in KNIGHT_TARGETS)
+_KING_MASKS = tuple(_mask(targets) for targets in KING_TARGETS)
+
+
+def _build_lines():
+    """
+    Builds a flat table looked up with initial * 64 + final that holds the
+    direction between two squares and a mask of the squares strictly in
+    between them, or None if the squares are not on a shared line
+    """
+    table = [None] * (64 * 64)
+    for index in range(64):
+        for direction, ray in enumerate(RAYS[index]):
+            between = 0
+            for square in ray:
+                table[index * 64 + square] = (direction, between)
+                between |= 1 << square
+    return tuple(table)
+
+
+_LINES = _build_lines()
+
+
+def _build_pawn_attacks(step):
+    """
+    Builds the mask of the two diagonal squares a pawn on each square can
+    capture on, step is 1 for white and -1 for black
+    """
+    masks = []
+    for index in range(64):
+        x = index % 8
+        y = index // 8 + step
+        mask = 0
+        if 0 <= y < 8:
+            if x > 0:
+                mask |= 1 << (y * 8 + x - 1)
+            if x < 7:
+                mask |= 1 << (y * 8 + x + 1)
+        masks.append(mask)
+    return tuple(masks)
+
+
+_PAWN_ATTACKS = (_build_pawn_attacks(1), _build_pawn_attacks(-1))
+
+
+def squares_of(bitboard):
+    """
+    Yields the index of every set bit in the bitboard, lowest first
+    """
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+class Bitboards:
+    """
+    Class holding one bitboard for every piece index (color * 6 + piece
+    type, the same as ChessPiece.get_index), plus an occupancy mask for each
+    color. Which pawns have not used their first move is kept by the game
+    and passed in as a mask where it is needed.
+    """
+
+    def __init__(self):
+        self._pieces = [0] * (len(COLORS) * len(PIECE_NAMES))
+        self._occupied = [0, 0]
+        self._all = 0
+
+    @classmethod
+    def from_board(cls, board):
+        """
+        Creates the bitboards from a ChessVar board list of piece objects
+        """
+        bitboards = cls()
+        for square, piece in enumerate(board):
+            if piece is not None:
+                bitboards.put(piece.get_index(), square)
+        return bitboards
+
+    def copy(self):
+        """
+        Returns a new Bitboards with the same pieces
+        """
+        bitboards = Bitboards.__new__(Bitboards)
+        bitboards._pieces = list(self._pieces)
+        bitboards._occupied = list(self._occupied)
+        bitboards._all = self._all
+        return bitboards
+
+    def to_board(self):
+        """
+        Returns a ChessVar board list with the piece object on each square
+        """
+        board = [None] * 64
+        for index, bitboard in enumerate(self._pieces):
+            piece = PIECES[index]
+            for square in squares_of(bitboard):
+                board[square] = piece
+        return board
+
+    def __getitem__(self, square):
+        """
+        Returns the piece object on the square index, or None, so the
+        bitboards can be read like a ChessVar board list, ex by AttackMaps
+        """
+        index = self.piece_at(square)
+        return None if index is None else PIECES[index]
+
+    def put(self, index, square):
+        """
+        Places a piece, given by its piece index, on an empty square
+        """
+        bit = 1 << square
+        self._pieces[index] |= bit
+        self._occupied[index >= _TYPES] |= bit
+        self._all |= bit
+
+    def remove(self, index, square):
+        """
+        Takes the piece with the piece index off the square
+        """
+        clear = ~(1 << square)
+        self._pieces[index] &= clear
+        self._occupied[index >= _TYPES] &= clear
+        self._all &= clear
+
+    def piece_at(self, square, color=None):
+        """
+        Returns the piece index of the piece on the square, or None if it
+        is empty. The color index can be given if it is already known
+        """
+        bit = 1 << square
+        if color is None:
+            if not self._all & bit:
+                return None
+            color = 0 if self._occupied[0] & bit else 1
+        pieces = self._pieces
+        for index in _COLOR_INDEXES[color]:
+            if pieces[index] & bit:
+                return index
+        return None
+
+    def move(self, index, initial, final, captured=None):
+        """
+        Moves the piece with the piece index from the initial square to the
+        final square, taking off the captured piece index if there is one
+        """
+        initial_bit = 1 << initial
+        final_bit = 1 << final
+        color = index >= _TYPES
+        if captured is not None:
+            self._pieces[captured] ^= final_bit
+            self._occupied[not color] ^= final_bit
+            self._all ^= initial_bit
+        else:
+            self._all ^= initial_bit | final_bit
+        self._pieces[index] ^= initial_bit | final_bit
+        self._occupied[color] ^= initial_bit | final_bit
+
+    def unmove(self, index, initial, final, captured=None):
+        """
+        Takes back a move made with move
+        """
+        # moving the piece back undoes its bits, then the captured piece
+        # is put back where it was
+        initial_bit = 1 << initial
+        final_bit = 1 << final
+        color = index >= _TYPES
+        self._pieces[index] ^= initial_bit | final_bit
+        self._occupied[color] ^= initial_bit | final_bit
+        if captured is not None:
+            self._pieces[captured] ^= final_bit
+            self._occupied[not color] ^= final_bit
+            self._all ^= initial_bit
+        else:
+            self._all ^= initial_bit | final_bit
+
+    def occupied(self, color=None):
+        """
+        Returns the occupancy mask for a color index, or for both colors
+        if no color is given
+        """
+        if color is None:
+            return self._all
+        return self._occupied[color]
+
+    def pieces(self, color, piece_type):
+        """
+        Returns the bitboard for a color and piece type index
+        """
+        return self._pieces[color * _TYPES + piece_type]
+
+    def has_type(self, color, piece_type):
+        """
+        Returns True if the color has any pieces of the type left
+        """
+        return self._pieces[color * _TYPES + piece_type] != 0
+
+    def count(self, index):
+        """
+        Returns how many pieces with the piece index are on the board
+        """
+        return bin(self._pieces[index]).count('1')
+
+    def slide_attacks(self, square, directions):
+        """
+        Returns the squares a sliding piece on the square can reach in the
+        given directions, stopping at (and including) the first blocker
+        """
+        attacks = 0
+        for direction in directions:
+            ray = _RAY_MASKS[square][direction]
+            blockers = ray & self._all
+            if blockers:
+                if direction in _POSITIVE_DIRECTIONS:
+                    blocker = (blockers & -blockers).bit_length() - 1
+                else:
+                    blocker = blockers.bit_length() - 1
+                ray ^= _RAY_MASKS[blocker][direction]
+            attacks |= ray
+        return attacks
+
+    def attacks(self, color, first_moves=0):
+        """
+        Returns a mask of every square the color's pieces attack, including
+        squares held by its own pieces. Pawns in the first_moves mask have
+        not used their first move and can not capture in this variant so
+        they are left out.
+        """
+        pieces = self._pieces[color * _TYPES:color * _TYPES + _TYPES]
+        result = 0
+        for square in squares_of(pieces[0] & ~first_moves):
+            result |= _PAWN_ATTACKS[color][square]
+        for square in squares_of(pieces[1]):
+            result |= self.slide_attacks(square, ROOK_DIRECTIONS)
+        for square in squares_of(pieces[2]):
+            result |= _KNIGHT_MASKS[square]
+        for square in squares_of(pieces[3]):
+            result |= self.slide_attacks(square, BISHOP_DIRECTIONS)
+        for square in squares_of(pieces[4]):
+            result |= self.slide_attacks(square, QUEEN_DIRECTIONS)
+        for square in squares_of(pieces[5]):
+            result |= _KING_MASKS[square]
+        return result
+
+    def targets(self, index, square, first_moves=0):
+        """
+        Returns the mask of squares the piece with the piece index on the
+        square could move to, including squares held by its own color,
+        using the same rules as valid_move
+        """
+        color, piece_type = divmod(index, _TYPES)
+        if piece_type == 0:
+            step = 8 if color == 0 else -8
+            targets = 0
+            ahead = square + step
+            if 0 <= ahead < 64 and not self._all >> ahead & 1:
+                targets = 1 << ahead
+                if first_moves >> square & 1:
+                    ahead += step
+                    if 0 <= ahead < 64 and not self._all >> ahead & 1:
+                        targets |= 1 << ahead
+            if not first_moves >> square & 1:
+                targets |= _PAWN_ATTACKS[color][square] & self._all
+            return targets
+        if piece_type == 2:
+            return _KNIGHT_MASKS[square]
+        if piece_type == 5:
+            return _KING_MASKS[square]
+        if piece_type == 1:
+            return self.slide_attacks(square, ROOK_DIRECTIONS)
+        if piece_type == 3:
+            return self.slide_attacks(square, BISHOP_DIRECTIONS)
+        return self.slide_attacks(square, QUEEN_DIRECTIONS)
+
+    def valid_move(self, index, initial, final, first_moves=0):
+        """
+        Checks if the piece with the piece index on the initial square can
+        move to the final square using the same rules as the piece classes.
+        first_moves is the mask of pawns that have not made their first move
+        """
+        final_bit = 1 << final
+        if index >= _TYPES:
+            color = 1
+            piece_type = index - _TYPES
+        else:
+            color = 0
+            piece_type = index
+
+        if piece_type == 0:
+            return self._pawn_move(color, initial, final, final_bit,
+                                   first_moves >> initial & 1 == 1)
+        if piece_type == 2:
+            return _KNIGHT_MASKS[initial] & final_bit != 0
+        if piece_type == 5:
+            return _KING_MASKS[initial] & final_bit != 0
+
+        line = _LINES[initial * 64 + final]
+        if line is None:
+            return False
+        direction, between = line
+        if piece_type == 1 and direction not in ROOK_DIRECTIONS:
+            return False
+        if piece_type == 3 and direction not in BISHOP_DIRECTIONS:
+            return False
+        return between & self._all == 0
+
+    def _pawn_move(self, color, initial, final, final_bit, first_move):
+        """
+        Checks a pawn move, white moves up the board and black moves down
+        """
+        step = 8 if color == 0 else -8
+
+        if final == initial + step:
+            return self._all & final_bit == 0
+        if first_move and final == initial + 2 * step:
+            return self._all & (final_bit | 1 << (initial + step)) == 0
+        if first_move:
+            return False
+        return _PAWN_ATTACKS[color][initial] & final_bit & self._all != 0
+
+
+class AttackMaps:
+    """
+    Class keeping a mask of the squares each piece attacks and, for each
+    square, a mask of the squares holding pieces that attack it. After a
+    move only the pieces on the changed squares and the pieces that were
+    attacking those squares (the only ones whose lines can open or close)
+    are worked out again. A pawn that has not made its first move can not
+    capture, so it attacks nothing.
+    """
+
+    def __init__(self, board, first_moves):
+        self._attacks = [0] * 64
+        self._attackers = [0] * 64
+        self._colors = [None] * 64
+        self._by_color = [None, None]
+        for square in range(64):
+            self._set_square(square, board, first_moves)
+
+    def copy(self):
+        """
+        Returns a new AttackMaps with the same masks
+        """
+        maps = AttackMaps.__new__(AttackMaps)
+        maps._attacks = list(self._attacks)
+        maps._attackers = list(self._attackers)
+        maps._colors = list(self._colors)
+        maps._by_color = list(self._by_color)
+        return maps
+
+    def _set_square(self, square, board, first_moves):
+        """
+        Works out the attacks of the piece on the square again and fixes
+        the attacker masks of the squares it gained or lost
+        """
+        piece = board[square]
+        if piece is None:
+            attacks = 0
+            color = None
+        else:
+            color, piece_type = divmod(piece.get_index(), len(PIECE_NAMES))
+            attacks = self.piece_attacks(square, color, piece_type, board, first_moves)
+        self._colors[square] = color
+        old = self._attacks[square]
+        if attacks == old:
+            return
+        bit = 1 << square
+        for target in squares_of(old & ~attacks):
+            self._attackers[target] &= ~bit
+        for target in squares_of(attacks & ~old):
+            self._attackers[target] |= bit
+        self._attacks[square] = attacks
+
+    @staticmethod
+    def piece_attacks(square, color, piece_type, board, first_moves):
+        """
+        Returns the mask of squares a piece of the color and type on the
+        square attacks on a ChessVar board list or a Bitboards
+        """
+        if piece_type == 0:
+            if first_moves >> square & 1:
+                return 0
+            return _PAWN_ATTACKS[color][square]
+        if piece_type == 2:
+            return _KNIGHT_MASKS[square]
+        if piece_type == 5:
+            return _KING_MASKS[square]
+        if piece_type == 1:
+            directions = ROOK_DIRECTIONS
+        elif piece_type == 3:
+            directions = BISHOP_DIRECTIONS
+        else:
+            directions = QUEEN_DIRECTIONS
+        if isinstance(board, Bitboards):
+            return board.slide_attacks(square, directions)
+        attacks = 0
+        rays = RAYS[square]
+        for direction in directions:
+            for target in rays[direction]:
+                attacks |= 1 << target
+                if board[target] is not None:
+                    break
+        return attacks
+
+    def update(self, squares, board, first_moves):
+        """
+        Brings the maps up to date after the pieces on the given squares
+        changed, with board (a board list or a Bitboards) and first_moves
+        already changed
+        """
+        affected = 0
+        for square in squares:
+            affected |= self._attackers[square] | 1 << square
+        for square in squares_of(affected):
+            self._set_square(square, board, first_moves)
+        self._by_color = [None, None]
+
+    def attacks(self, color):
+        """
+        Returns the mask of every square the color's pieces attack,
+        including squares held by its own pieces
+        """
+        result = self._by_color[color]
+        if result is None:
+            result = 0
+            colors = self._colors
+            for square, attacks in enumerate(self._attacks):
+                if colors[square] == color:
+                    result |= attacks
+            self._by_color[color] = result
+        return result
+
+    def attackers(self, square):
+        """
+        Returns the mask of squares holding pieces that attack the square
+        """
+        return self._attackers[square]
+
+    def matches(self, other):
+        """
+        Returns True if the other AttackMaps has the same masks, ex to check
+        maps kept up to date with update against maps made from the board
+        """
+        return (self._attacks == other._attacks and self._attackers == other._attackers
+                and self._colors == other._colors)
+
+
+class BitboardGame(ChessVar):
+    """
+    Class for a ChessVar game that keeps its position only in Bitboards,
+    made by ChessVar(engine='bitboard'). There is no board list or piece
+    count dictionary, piece objects and board lists are made from the
+    bitboards when they are asked for. Moves, rejection reasons and move
+    order are the same as the default engine.
+    """
+
+    def _set_defaults(self, engine='bitboard'):
+        super()._set_defaults('bitboard')
+
+    def initialize_board(self):
+        """
+        Sets up the starting board by copying the bitboards built once when
+        the module is loaded
+        """
+        self._bitboards = _STARTING_BITBOARDS.copy()
+        self._shared = False
+        self._attack_maps = None
+        self._first_moves = _STARTING_FIRST_MOVES
+        self._undo_stack = []
+        self._hash = starting_hash(self._turn)
+
+    def _set_position(self, board, turn, game_state, first_moves):
+        """
+        Puts a saved position given as a board list on the bitboards
+        """
+        self._bitboards = Bitboards.from_board(board)
+        self._shared = False
+        self._attack_maps = None
+        self._turn = turn
+        self._game_state = game_state
+        self._first_moves = first_moves
+        self._undo_stack = []
+        self._hash = zobrist_hash(board, turn, first_moves)
+
+    def _unshare(self):
+        """
+        Gives the game its own copy of the bitboards and attack maps
+        """
+        self._bitboards = self._bitboards.copy()
+        if self._attack_maps is not None:
+            self._attack_maps = self._attack_maps.copy()
+        self._shared = False
+
+    def _squares(self):
+        """
+        Returns the position as a new board list made from the bitboards
+        """
+        return self._bitboards.to_board()
+
+    def get_piece(self, square):
+        """
+        Returns the piece object on the square, ex 'a1', or None
+        """
+        return self.piece_at(SQUARE_INDEX[square])
+
+    def piece_at(self, index):
+        """
+        Returns the piece object on the square index, or None
+        """
+        return self._bitboards[index]
+
+    def get_piece_count(self, color, name):
+        """
+        Returns how many pieces of the type the color has left on the board
+        """
+        return self._bitboards.count(COLORS.index(color) * _TYPES + PIECE_NAMES.index(name))
+
+    def get_piece_counts(self, color):
+        """
+        Returns a dictionary of how many pieces of each type the color
+        has left on the board
+        """
+        offset = COLORS.index(color) * _TYPES
+        return {name: self._bitboards.count(offset + piece_type)
+                for piece_type, name in enumerate(PIECE_NAMES)}
+
+    def update_game_state(self):
+        """
+        Same as ChessVar.update_game_state, with an empty bitboard meaning
+        none of the type are left
+        """
+        # go through the types in the same order as ChessVar, since the
+        # last type missing for either color decides the winner
+        pieces = self._bitboards._pieces
+        for piece_type in range(_TYPES):
+            if not pieces[piece_type]:
+                self._game_state = 'BLACK_WON'
+            if not pieces[_TYPES + piece_type]:
+                self._game_state = 'WHITE_WON'
+
+    def find_move(self, initial_spot, final_spot, profiler=None):
+        """
+        Same as ChessVar.find_move, with the checks made on the occupancy
+        masks instead of piece objects
+        """
+        if self._game_state != 'UNFINISHED':
+            self._rejection = 'game_over'
+            return None
+
+        if profiler is not None:
+            start = time.perf_counter()
+        initial = SQUARE_INDEX.get(initial_spot)
+        final = SQUARE_INDEX.get(final_spot)
+        if profiler is not None:
+            profiler.record('check_bounds', time.perf_counter() - start)
+        if initial is None or final is None:
+            self._rejection = 'out_of_bounds'
+            return None
+
+        bitboards = self._bitboards
+        white = bitboards._occupied[0]
+        if not bitboards._all >> initial & 1:
+            self._rejection = 'empty_square'
+            return None
+        color = 0 if white >> initial & 1 else 1
+
+        if bitboards._occupied[color] >> final & 1:
+            self._rejection = 'own_piece_capture'
+            return None
+
+        if self._turn != COLORS[color]:
+            self._rejection = 'wrong_turn'
+            return None
+
+        piece = PIECES[bitboards.piece_at(initial, color)]
+        if profiler is None:
+            valid = self.is_valid_move(piece, initial, final)
+        else:
+            start = time.perf_counter()
+            valid = self.is_valid_move(piece, initial, final)
+            profiler.record('valid_move_' + piece.get_name(), time.perf_counter() - start)
+        if not valid:
+            self._rejection = 'illegal_geometry'
+            return None
+        return initial, final
+
+    def _check_move(self, piece, initial, final):
+        """
+        Checks a move for the piece on the bitboards, without the cache
+        """
+        return self._bitboards.valid_move(piece.get_index(), initial, final, self._first_moves)
+
+    def _move_piece(self, initial, final):
+        """
+        Does the work of apply_move apart from checking if the game is over
+        """
+        if self._shared:
+            self._unshare()
+        bitboards = self._bitboards
+        index = bitboards.piece_at(initial)
+        captured = None
+        if bitboards._all >> final & 1:
+            captured = bitboards.piece_at(final, index < _TYPES)
+        piece = PIECES[index]
+        captured_piece = None if captured is None else PIECES[captured]
+        first_moves = self._first_moves
+        undo = (initial, final, piece, captured_piece, self._turn, self._game_state,
+                first_moves, self._hash)
+
+        self._hash, first_moves = moved_hash(self._hash, first_moves, piece, captured_piece,
+                                             initial, final)
+        self._first_moves = first_moves
+        self._turn = 'black' if self._turn == 'white' else 'white'
+        bitboards.move(index, initial, final, captured)
+        if self._attack_maps is not None:
+            self._attack_maps.update((initial, final), bitboards, first_moves)
+        return undo
+
+    def pop_move(self):
+        """
+        Takes back the last move made with push_move or push_indexes and
+        returns it as a pair of spots
+        """
+        (initial, final, piece, captured, turn, game_state, first_moves,
+         position_hash) = self._undo_stack.pop()
+        if self._shared:
+            self._unshare()
+        self._bitboards.unmove(piece.get_index(), initial, final,
+                               None if captured is None else captured.get_index())
+        self._first_moves = first_moves
+        if self._attack_maps is not None:
+            self._attack_maps.update((initial, final), self._bitboards, first_moves)
+        self._turn = turn
+        self._game_state = game_state
+        self._hash = position_hash
+        return SQUARE_NAMES[initial], SQUARE_NAMES[final]
+
+    def _generate_moves(self, initial):
+        """
+        Yields the legal moves for generate_moves from the bitboards, in
+        the same order as the default engine
+        """
+        bitboards = self._bitboards
+        color = COLORS.index(self._turn)
+        own = bitboards._occupied[color]
+        first_moves = self._first_moves
+        if initial is None:
+            squares = squares_of(own)
+        elif own >> initial & 1:
+            squares = (initial,)
+        else:
+            return
+        for square in squares:
+            index = bitboards.piece_at(square, color)
+            targets = bitboards.targets(index, square, first_moves) & ~own
+            for final in _CANDIDATES[index * 64 + square]:
+                if targets >> final & 1:
+                    yield square, final
+
+
+_STARTING_BITBOARDS = Bitboards.from_board(_STARTING_BOARD)
+
+# every square each piece index could move to from each square on an
+# empty board, in the order move_candidates gives them, looked up with
+# index * 64 + square so moves come out in the default engine's order
+_CANDIDATES = tuple(tuple(PIECES[index].move_candidates(square, [None] * 64))
+                    for index in range(len(PIECES)) for square in range(64))
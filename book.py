@@ -0,0 +1,262 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: An opening book for ChessVar built from finished games. Every
+#                game starts from the same board, so the builder replays game
+#                archives (one line of moves per game, like replay.py reads) or
+#                self play records, and for each position in the first few
+#                plies adds up how often each move was played and how those
+#                games ended. The book file is a sorted array of fixed size
+#                (position hash, move, weight) records, where the weight is two
+#                for each win and one for each draw by the side that played the
+#                move. A lookup opens the file with mmap and binary searches it,
+#                so a book loads instantly and answers without any search.
+#
+#                Usage: python book.py build ARCHIVE [ARCHIVE ...] [--output book.bin]
+#                                        [--plies 12] [--selfplay 10000]
+#                       python book.py probe BOOK [MOVE ...]
+
+import argparse
+import collections
+import mmap
+import struct
+import sys
+
+from ChessVar import ChessVar, SQUARE_INDEX, SQUARE_NAMES
+
+MAGIC = b'CVBK'
+VERSION = 1
+# magic, version, record count
+_HEADER = struct.Struct('<4sB3xQ')
+# position hash, move (initial square * 64 + final square), weight
+_RECORD = struct.Struct('<QHxxI')
+
+# how many plies from the start of each game go in the book
+DEFAULT_PLIES = 12
+
+
+class BookBuilder:
+    """
+    Class that adds up the moves played in the first plies of many games
+    and writes them out as a book.
+    """
+
+    def __init__(self, plies=DEFAULT_PLIES):
+        self._plies = plies
+        # (position hash, move code) -> [games, wins, draws]
+        self._moves = collections.defaultdict(lambda: [0, 0, 0])
+        self._games = 0
+
+    def get_game_count(self):
+        """
+        Returns how many games have been added
+        """
+        return self._games
+
+    def add_game(self, moves):
+        """
+        Replays a game given as (initial, final) square index pairs or
+        strings like 'a2a4' and adds its first plies. Returns False and
+        adds nothing if a move is not legal
+        """
+        game = ChessVar()
+        played = []
+        for move in moves:
+            if isinstance(move, str):
+                move = (SQUARE_INDEX.get(move[:2]), SQUARE_INDEX.get(move[2:]))
+            if move[0] is None or move[1] is None:
+                return False
+            if len(played) < self._plies:
+                played.append((game.position_hash(), move[0] << 6 | move[1], game.get_turn()))
+            if game.find_move(SQUARE_NAMES[move[0]], SQUARE_NAMES[move[1]]) is None:
+                return False
+            game.apply_move(move[0], move[1])
+
+        state = game.get_game_state()
+        for position_hash, code, color in played:
+            stats = self._moves[position_hash, code]
+            stats[0] += 1
+            if state == 'UNFINISHED':
+                stats[2] += 1
+            elif state == ('WHITE_WON' if color == 'white' else 'BLACK_WON'):
+                stats[1] += 1
+        self._games += 1
+        return True
+
+    def add_archive(self, path):
+        """
+        Adds every game in a text archive of one line of moves per game.
+        Returns how many games were added
+        """
+        added = 0
+        with open(path) as archive:
+            for line in archive:
+                if self.add_game(line.split()):
+                    added += 1
+        return added
+
+    def add_records(self, records):
+        """
+        Adds self play records of (game number, state, packed moves) from
+        selfplay.self_play. Returns how many games were added
+        """
+        from selfplay import decode_moves
+
+        added = 0
+        for number, state, moves in records:
+            if self.add_game(decode_moves(moves)):
+                added += 1
+        return added
+
+    def records(self, min_games=1):
+        """
+        Returns the sorted list of (position hash, move code, weight)
+        records for moves played at least min_games times with a weight
+        above zero
+        """
+        records = []
+        for (position_hash, code), (games, wins, draws) in self._moves.items():
+            weight = 2 * wins + draws
+            if games >= min_games and weight > 0:
+                records.append((position_hash, code, weight))
+        records.sort()
+        return records
+
+    def write(self, path, min_games=1):
+        """
+        Writes the book to a file and returns how many records it holds
+        """
+        records = self.records(min_games)
+        with open(path, 'wb') as book_file:
+            book_file.write(_HEADER.pack(MAGIC, VERSION, len(records)))
+            for record in records:
+                book_file.write(_RECORD.pack(*record))
+        return len(records)
+
+
+class OpeningBook:
+    """
+    Class for reading a book file through mmap.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as book_file:
+            self._data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self._count = _HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            self._data.close()
+            raise ValueError('%s is not an opening book' % path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _key_at(self, number):
+        """
+        Returns the position hash of record number
+        """
+        return struct.unpack_from('<Q', self._data, _HEADER.size + number * _RECORD.size)[0]
+
+    def lookup(self, game):
+        """
+        Returns a list of (move, weight) pairs for the game's position,
+        where move is a pair of spots like ('e2', 'e4'), or an empty list
+        if the position is not in the book
+        """
+        key = game.position_hash()
+        low = 0
+        high = self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        moves = []
+        while low < self._count:
+            position_hash, code, weight = _RECORD.unpack_from(
+                self._data, _HEADER.size + low * _RECORD.size)
+            if position_hash != key:
+                break
+            moves.append(((SQUARE_NAMES[code >> 6], SQUARE_NAMES[code & 63]), weight))
+            low += 1
+        return moves
+
+    def book_move(self, game, rng=None):
+        """
+        Returns a book move for the game as a pair of spots, or None if
+        the position is not in the book or the game is over. With an rng
+        the move is picked at random by weight, otherwise the heaviest
+        move is returned. Moves that are not legal in the game, which can
+        only happen if two positions share a hash, are skipped
+        """
+        if game.get_game_state() != 'UNFINISHED':
+            return None
+        moves = [(move, weight) for move, weight in self.lookup(game)
+                 if game.find_move(move[0], move[1]) is not None]
+        if not moves:
+            return None
+        if rng is None:
+            return max(moves, key=lambda pair: pair[1])[0]
+        return rng.choices([move for move, weight in moves],
+                           weights=[weight for move, weight in moves])[0]
+
+    def close(self):
+        """
+        Closes the book file
+        """
+        self._data.close()
+
+
+def main(argv=None):
+    """
+    Builds a book or prints the book moves for a position
+    """
+    parser = argparse.ArgumentParser(description='Build or read a ChessVar opening book.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='build a book from game archives or self play')
+    build.add_argument('archives', nargs='*')
+    build.add_argument('--output', default='book.bin')
+    build.add_argument('--plies', type=int, default=DEFAULT_PLIES)
+    build.add_argument('--min-games', type=int, default=1)
+    build.add_argument('--selfplay', type=int, default=0,
+                       help='also add this many greedy self play games')
+    build.add_argument('--workers', type=int, default=None)
+    probe = commands.add_parser('probe', help='print the book moves after some moves')
+    probe.add_argument('book')
+    probe.add_argument('moves', nargs='*')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        from selfplay import self_play
+
+        builder = BookBuilder(args.plies)
+        for path in args.archives:
+            builder.add_archive(path)
+        if args.selfplay:
+            builder.add_records(self_play(args.selfplay, 'greedy', 'greedy', workers=args.workers))
+        count = builder.write(args.output, args.min_games)
+        print('%d games, %d book records written to %s' % (builder.get_game_count(), count, args.output))
+        return 0
+
+    game = ChessVar()
+    for move in args.moves:
+        if not game.make_move(move[:2], move[2:]):
+            print('%s is not a legal move' % move)
+            return 1
+    with OpeningBook(args.book) as book:
+        moves = sorted(book.lookup(game), key=lambda pair: -pair[1])
+    if not moves:
+        print('position is not in the book')
+    for (initial, final), weight in moves:
+        print('%s%s %d' % (initial, final, weight))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
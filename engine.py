@@ -0,0 +1,394 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: A search engine that picks moves for a ChessVar game. It uses
+#                iterative deepening alpha-beta search with a transposition
+#                table keyed on the game's position hash. Captures are tried
+#                first in most valuable victim / least valuable attacker order,
+#                followed by killer moves. A position where the side that just
+#                moved took the last of one of the opponent's piece types is a
+#                loss for the side to move, the same as update_game_state.
+
+import random
+import time
+
+from ChessVar import PIECE_NAMES, SQUARE_NAMES
+
+# the score for winning the game, a win found closer to the root scores higher
+WIN_SCORE = 100000
+
+# the highest depth iterative deepening will go to when no depth is given
+MAX_DEPTH = 64
+
+# the value of each piece type, in PIECE_NAMES order
+PIECE_VALUES = (100, 500, 300, 300, 900, 1000)
+
+# how much it costs to have only one or two pieces of a type left, since
+# losing every piece of any type loses the game
+SCARCITY_PENALTY = {1: 400, 2: 60}
+
+# transposition table entry flags
+_EXACT = 0
+_LOWER = 1
+_UPPER = 2
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the time budget runs out
+    """
+    pass
+
+
+class SearchResult:
+    """
+    Class holding the best move found by a search along with its score and
+    how fast the search went
+    """
+
+    def __init__(self, move, score, depth, nodes, seconds):
+        self._move = move
+        self._score = score
+        self._depth = depth
+        self._nodes = nodes
+        self._seconds = seconds
+
+    def get_move(self):
+        """
+        Returns the best move as a pair of spots, ex ('a2', 'a4'), or None
+        if the side to move has no moves
+        """
+        return self._move
+
+    def get_score(self):
+        """
+        Returns the score of the best move for the side to move
+        """
+        return self._score
+
+    def get_depth(self):
+        """
+        Returns the deepest search depth that was completed
+        """
+        return self._depth
+
+    def get_nodes(self):
+        """
+        Returns how many positions were searched
+        """
+        return self._nodes
+
+    def get_seconds(self):
+        """
+        Returns how long the search took in seconds
+        """
+        return self._seconds
+
+    def get_nodes_per_second(self):
+        """
+        Returns how many positions were searched per second
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return self._nodes / self._seconds
+
+
+def evaluate(game):
+    """
+    Scores the position for the side to move. Adds up the value of each
+    side's pieces and takes off a penalty for every type a side is down
+    to its last one or two of
+    """
+    score = 0
+    for piece_type, name in enumerate(PIECE_NAMES):
+        white = game.get_piece_count('white', name)
+        black = game.get_piece_count('black', name)
+        score += PIECE_VALUES[piece_type] * (white - black)
+        score -= SCARCITY_PENALTY.get(white, 0)
+        score += SCARCITY_PENALTY.get(black, 0)
+    if game.get_turn() == 'white':
+        return score
+    return -score
+
+
+class Engine:
+    """
+    Class that searches ChessVar positions. The transposition table and
+    killer moves are kept between searches so later moves in the same
+    game can reuse them. A table with get and item assignment, like the
+    SharedTable from smp.py, can be passed in to use instead of a
+    dictionary, in which case it looks after its own size. A seed makes
+    the engine try quiet moves in a random order, which the parallel
+    search uses so its helpers look at different moves first.
+    """
+
+    def __init__(self, table_size=1 << 20, table=None, seed=None):
+        if table is None:
+            self._table_size = table_size
+            self._table = {}
+        else:
+            self._table_size = None
+            self._table = table
+        self._rng = None if seed is None else random.Random(seed)
+        self._killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+        self._nodes = 0
+        self._deadline = None
+        self._stop = None
+        self._last_result = None
+
+    def set_stop(self, stop):
+        """
+        Sets a function that is called now and then during a search and
+        ends the search the same way as the time limit when it returns
+        True, or None to not have one
+        """
+        self._stop = stop
+
+    def get_last_result(self):
+        """
+        Returns the SearchResult of the last search, or None
+        """
+        return self._last_result
+
+    def clear(self):
+        """
+        Empties the transposition table and killer moves
+        """
+        self._table.clear()
+        self._killers = [[None, None] for _ in range(MAX_DEPTH + 1)]
+
+    def search(self, game, depth=None, time_limit=1.0):
+        """
+        Searches the game's position one depth at a time until the depth
+        is reached or the time limit in seconds runs out, whichever is
+        first. If depth is None the search goes until the time runs out,
+        and if time_limit is None it goes until the depth is reached.
+        The game is left the way it was. Returns a SearchResult
+        """
+        if depth is None and time_limit is None:
+            raise ValueError('a depth or a time limit is needed')
+        max_depth = MAX_DEPTH if depth is None else min(depth, MAX_DEPTH)
+
+        start = time.perf_counter()
+        self._deadline = None if time_limit is None else start + time_limit
+        self._nodes = 0
+
+        best_move = None
+        best_score = 0
+        completed = 0
+        for current_depth in range(1, max_depth + 1):
+            try:
+                score, move = self._search_root(game, current_depth)
+            except SearchTimeout:
+                break
+            completed = current_depth
+            best_score = score
+            if move is not None:
+                best_move = move
+            # nothing deeper can change a won or lost position
+            if abs(score) >= WIN_SCORE - MAX_DEPTH:
+                break
+            if self._deadline is not None and time.perf_counter() >= self._deadline:
+                break
+
+        seconds = time.perf_counter() - start
+        if best_move is not None:
+            best_move = (SQUARE_NAMES[best_move[0]], SQUARE_NAMES[best_move[1]])
+        self._last_result = SearchResult(best_move, best_score, completed,
+                                         self._nodes, seconds)
+        return self._last_result
+
+    def _search_root(self, game, depth):
+        """
+        Searches every move from the root and returns the best score and move
+        """
+        # the first depth always finishes so there is always a move to play
+        if depth == 1:
+            deadline = self._deadline
+            stop = self._stop
+            self._deadline = None
+            self._stop = None
+            try:
+                return self._alpha_beta(game, depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+            finally:
+                self._deadline = deadline
+                self._stop = stop
+        return self._alpha_beta(game, depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+
+    def _alpha_beta(self, game, depth, alpha, beta, ply):
+        """
+        Negamax alpha-beta search. Returns the score for the side to move
+        and the best move found as a pair of square indexes
+        """
+        self._nodes += 1
+        if self._nodes & 1023 == 0:
+            self._check_time()
+
+        # the side that just moved took the last of one of our piece types
+        if game.get_game_state() != 'UNFINISHED':
+            return -(WIN_SCORE - ply), None
+
+        if depth <= 0:
+            return self._quiescence(game, alpha, beta, ply), None
+
+        key = game.position_hash()
+        original_alpha = alpha
+        entry = self._table.get(key)
+        table_move = None
+        if entry is not None:
+            entry_depth, entry_score, flag, table_move = entry
+            if entry_depth >= depth and ply > 0:
+                entry_score = _score_from_table(entry_score, ply)
+                if flag == _EXACT:
+                    return entry_score, table_move
+                if flag == _LOWER and entry_score >= beta:
+                    return entry_score, table_move
+                if flag == _UPPER and entry_score <= alpha:
+                    return entry_score, table_move
+
+        moves = self._order_moves(game, list(game.generate_moves()), table_move, ply)
+        # with no moves to make neither side can win from here
+        if not moves:
+            return 0, None
+
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in moves:
+            captured = game.piece_at(move[1])
+            game.push_indexes(move[0], move[1])
+            try:
+                score = -self._alpha_beta(game, depth - 1, -beta, -alpha, ply + 1)[0]
+            finally:
+                game.pop_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                if captured is None:
+                    self._add_killer(move, ply)
+                break
+
+        if best_score <= original_alpha:
+            flag = _UPPER
+        elif best_score >= beta:
+            flag = _LOWER
+        else:
+            flag = _EXACT
+        if self._table_size is not None and len(self._table) >= self._table_size:
+            self._table.clear()
+        self._table[key] = (depth, _score_to_table(best_score, ply), flag, best_move)
+        return best_score, best_move
+
+    def _check_time(self):
+        """
+        Raises SearchTimeout if the time limit has run out or the stop
+        function says to stop
+        """
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchTimeout()
+        if self._stop is not None and self._stop():
+            raise SearchTimeout()
+
+    def _quiescence(self, game, alpha, beta, ply):
+        """
+        Keeps searching captures past the depth limit so the score is not
+        taken in the middle of an exchange
+        """
+        stand_pat = evaluate(game)
+        if stand_pat >= beta:
+            return stand_pat
+        if stand_pat > alpha:
+            alpha = stand_pat
+
+        captures = [move for move in game.generate_moves() if game.piece_at(move[1]) is not None]
+        for move in self._order_moves(game, captures, None, None):
+            self._nodes += 1
+            if self._nodes & 1023 == 0:
+                self._check_time()
+            game.push_indexes(move[0], move[1])
+            try:
+                if game.get_game_state() != 'UNFINISHED':
+                    score = WIN_SCORE - ply - 1
+                else:
+                    score = -self._quiescence(game, -beta, -alpha, ply + 1)
+            finally:
+                game.pop_move()
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _order_moves(self, game, moves, table_move, ply):
+        """
+        Sorts the moves so the table move is first, then captures with the
+        most valuable victim and least valuable attacker, then killer moves
+        """
+        if ply is None:
+            killers = ()
+        else:
+            killers = self._killers[ply]
+        rng = self._rng
+
+        def move_order(move):
+            if move == table_move:
+                return -1000000
+            captured = game.piece_at(move[1])
+            if captured is not None:
+                victim = PIECE_VALUES[captured.get_index() % len(PIECE_NAMES)]
+                attacker = PIECE_VALUES[game.piece_at(move[0]).get_index() % len(PIECE_NAMES)]
+                return -(victim * 10 - attacker) - 10000
+            if move in killers:
+                return -100
+            if rng is not None:
+                return rng.random()
+            return 0
+
+        moves.sort(key=move_order)
+        return moves
+
+    def _add_killer(self, move, ply):
+        """
+        Remembers a quiet move that caused a cutoff at this ply
+        """
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+
+def _score_to_table(score, ply):
+    """
+    Stores win scores as distance from the current position instead of
+    from the root, so they stay correct when reached from another line
+    """
+    if score >= WIN_SCORE - MAX_DEPTH * 2:
+        return score + ply
+    if score <= -(WIN_SCORE - MAX_DEPTH * 2):
+        return score - ply
+    return score
+
+
+def _score_from_table(score, ply):
+    """
+    Turns a stored win score back into a distance from the root
+    """
+    if score >= WIN_SCORE - MAX_DEPTH * 2:
+        return score - ply
+    if score <= -(WIN_SCORE - MAX_DEPTH * 2):
+        return score + ply
+    return score
+
+
+def best_move(game, depth=None, time_limit=1.0, engine=None):
+    """
+    Returns the best move for the side to move in the game as a pair of
+    spots, ex ('b1', 'c3'), or None if there are no moves. The stats of the
+    search, including nodes per second, are kept on the engine and can be
+    read with engine.get_last_result()
+    """
+    if engine is None:
+        engine = Engine()
+    return engine.search(game, depth, time_limit).get_move()
@@ -0,0 +1,179 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: Move events for keeping a copy of a game up to date without
+#                sending the whole board. A function subscribed to a game with
+#                ChessVar.subscribe is called with a MoveEvent after every move
+#                make_move makes, holding the spots that changed, the piece
+#                moved and the piece captured, the new turn and the new game
+#                state if the move ended the game. An event packs into four
+#                bytes, so a server can push it to clients or append it to a
+#                log with EventLog, and a client plays it on its own copy of the
+#                game with apply_move. A game with no subscribers does not make
+#                events at all.
+
+import struct
+
+from ChessVar import FEN_LETTERS, GAME_STATES, PIECES, SQUARE_INDEX, SQUARE_NAMES
+
+# initial square, final square, moved and captured piece codes, turn and state
+_PACKED = struct.Struct('<BBBB')
+
+
+class MoveEvent:
+    """
+    Class for one move made on a game. Pieces are the shared piece objects,
+    and the game state is None unless the move changed it
+    """
+
+    def __init__(self, initial, final, piece, captured, turn, game_state, position_hash=None):
+        self._initial = initial
+        self._final = final
+        self._piece = piece
+        self._captured = captured
+        self._turn = turn
+        self._game_state = game_state
+        self._hash = position_hash
+
+    def __repr__(self):
+        return 'MoveEvent(%s%s)' % (self.get_initial(), self.get_final())
+
+    def get_initial(self):
+        """
+        Returns the spot the piece moved from, ex 'a2'
+        """
+        return SQUARE_NAMES[self._initial]
+
+    def get_final(self):
+        """
+        Returns the spot the piece moved to, ex 'a4'
+        """
+        return SQUARE_NAMES[self._final]
+
+    def get_indexes(self):
+        """
+        Returns the (initial, final) square indexes, which apply_move takes
+        """
+        return self._initial, self._final
+
+    def get_piece(self):
+        """
+        Returns the piece that moved
+        """
+        return self._piece
+
+    def get_captured(self):
+        """
+        Returns the piece that was captured, or None
+        """
+        return self._captured
+
+    def get_turn(self):
+        """
+        Returns whose turn it is after the move
+        """
+        return self._turn
+
+    def get_game_state(self):
+        """
+        Returns the new game state if the move changed it, otherwise None
+        """
+        return self._game_state
+
+    def get_position_hash(self):
+        """
+        Returns the game's position hash after the move, or None for an
+        event read back with from_bytes, which does not carry it
+        """
+        return self._hash
+
+    def get_changed_squares(self):
+        """
+        Returns a list of (spot, piece) pairs for the squares the move
+        changed, with None for a square that is now empty
+        """
+        return [(SQUARE_NAMES[self._initial], None), (SQUARE_NAMES[self._final], self._piece)]
+
+    def to_dict(self):
+        """
+        Returns the event as a dictionary that can be written as JSON, with
+        pieces as the letters to_fen uses
+        """
+        return {'initial': self.get_initial(),
+                'final': self.get_final(),
+                'piece': FEN_LETTERS[self._piece.get_index()],
+                'captured': (None if self._captured is None
+                             else FEN_LETTERS[self._captured.get_index()]),
+                'turn': self._turn,
+                'game_state': self._game_state}
+
+    def to_bytes(self):
+        """
+        Packs the event into four bytes: the two square indexes, the moved
+        and captured piece codes (piece index plus one, 0 for none) in one
+        byte, and the turn and game state in the last
+        """
+        captured = 0 if self._captured is None else self._captured.get_index() + 1
+        state = 0 if self._game_state is None else GAME_STATES.index(self._game_state) + 1
+        return _PACKED.pack(self._initial, self._final,
+                            (self._piece.get_index() + 1) << 4 | captured,
+                            (self._turn == 'black') | state << 1)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reads back an event packed with to_bytes
+        """
+        initial, final, pieces, flags = _PACKED.unpack(data)
+        captured = pieces & 15
+        state = flags >> 1
+        return cls(initial, final, PIECES[(pieces >> 4) - 1],
+                   PIECES[captured - 1] if captured else None,
+                   'black' if flags & 1 else 'white',
+                   GAME_STATES[state - 1] if state else None)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reads back an event written with to_dict
+        """
+        captured = data['captured']
+        return cls(SQUARE_INDEX[data['initial']], SQUARE_INDEX[data['final']],
+                   PIECES[FEN_LETTERS.index(data['piece'])],
+                   None if captured is None else PIECES[FEN_LETTERS.index(captured)],
+                   data['turn'], data['game_state'])
+
+
+class EventLog:
+    """
+    Class that can be subscribed to a game to append each of its events to
+    a binary file, four bytes per move
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+
+    def __call__(self, event):
+        self._file.write(event.to_bytes())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes the log file
+        """
+        self._file.close()
+
+
+def read_events(path):
+    """
+    Yields the MoveEvents saved in a log written by EventLog
+    """
+    with open(path, 'rb') as log:
+        data = log.read()
+    for offset in range(0, len(data) - _PACKED.size + 1, _PACKED.size):
+        yield MoveEvent.from_bytes(data[offset:offset + _PACKED.size])
@@ -0,0 +1,302 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: An append only binary store for large numbers of ChessVar games
+#                that can jump straight to any move of any game. A store is two
+#                files. The data file holds each game's moves packed into 12
+#                bits (6 bits for the initial square and 6 for the final), and
+#                after the moves, if turned on, a 33 byte to_bytes checkpoint
+#                of the position every so many moves. The index file holds the
+#                offset and move count of each game in fixed size entries, so
+#                game N is found without reading the games before it. Both
+#                files are read through mmap and memoryview, so nothing is
+#                copied until a move or checkpoint is decoded.
+#
+#                Usage: python gamestore.py build ARCHIVE STORE [--checkpoint 16]
+#                       python gamestore.py show STORE GAME [PLY]
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+
+from ChessVar import ChessVar, SQUARE_INDEX, SQUARE_NAMES
+
+# data file header: magic, version, checkpoint interval (0 for none)
+DATA_MAGIC = b'CVGS'
+_DATA_HEADER = struct.Struct('<4sBxH')
+# index file header: magic, then one entry per game of offset and move count
+INDEX_MAGIC = b'CVGI'
+_INDEX_HEADER = struct.Struct('<4s4x')
+_INDEX_ENTRY = struct.Struct('<QI')
+VERSION = 1
+# size of a to_bytes checkpoint
+CHECKPOINT_SIZE = 33
+
+
+def index_path(path):
+    """
+    Returns the path of the index file that goes with a data file
+    """
+    return path + '.idx'
+
+
+def packed_size(move_count):
+    """
+    Returns how many bytes a number of moves takes at 12 bits each
+    """
+    return (move_count * 3 + 1) // 2
+
+
+def pack_moves(moves):
+    """
+    Packs a list of (initial, final) square index pairs into bytes at 12
+    bits per move. Every two moves take three bytes
+    """
+    data = bytearray(packed_size(len(moves)))
+    for number, (initial, final) in enumerate(moves):
+        code = initial << 6 | final
+        position = number * 3 // 2
+        if number & 1:
+            data[position] |= (code & 15) << 4
+            data[position + 1] = code >> 4
+        else:
+            data[position] = code & 255
+            data[position + 1] = code >> 8
+    return bytes(data)
+
+
+def unpack_move(data, number):
+    """
+    Returns move number (from 0) in packed moves as an (initial, final) pair
+    """
+    position = number * 3 // 2
+    if number & 1:
+        code = data[position] >> 4 | data[position + 1] << 4
+    else:
+        code = data[position] | (data[position + 1] & 15) << 8
+    return code >> 6, code & 63
+
+
+def unpack_moves(data, move_count):
+    """
+    Returns the first move_count moves in packed moves as a list of pairs
+    """
+    return [unpack_move(data, number) for number in range(move_count)]
+
+
+class GameStoreWriter:
+    """
+    Class that appends games to a store, creating it if it does not exist.
+    Every game is replayed as it is added so only legal games are stored
+    and the checkpoints can be taken. A store that already exists keeps
+    the checkpoint interval it was made with.
+    """
+
+    def __init__(self, path, checkpoint_interval=0):
+        self._path = path
+        if os.path.exists(path):
+            with open(path, 'rb') as data_file:
+                magic, version, checkpoint_interval = _DATA_HEADER.unpack(
+                    data_file.read(_DATA_HEADER.size))
+            if magic != DATA_MAGIC or version != VERSION:
+                raise ValueError('%s is not a game store' % path)
+            self._data = open(path, 'ab')
+            self._index = open(index_path(path), 'ab')
+        else:
+            self._data = open(path, 'wb')
+            self._data.write(_DATA_HEADER.pack(DATA_MAGIC, VERSION, checkpoint_interval))
+            self._index = open(index_path(path), 'wb')
+            self._index.write(_INDEX_HEADER.pack(INDEX_MAGIC))
+        self._checkpoint_interval = checkpoint_interval
+        self._offset = self._data.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_checkpoint_interval(self):
+        """
+        Returns how many moves there are between checkpoints, 0 for none
+        """
+        return self._checkpoint_interval
+
+    def add_game(self, moves):
+        """
+        Appends a game given as a list of moves, each either an (initial,
+        final) square index pair or a string like 'a2a4'. Raises ValueError
+        if a move is not legal, in which case nothing is written
+        """
+        game = ChessVar()
+        pairs = []
+        checkpoints = []
+        for move in moves:
+            if isinstance(move, str):
+                move = (SQUARE_INDEX.get(move[:2]), SQUARE_INDEX.get(move[2:]))
+            initial, final = move
+            if (initial is None or final is None
+                    or not game.make_move(SQUARE_NAMES[initial], SQUARE_NAMES[final])):
+                raise ValueError('move %d of the game is not legal' % len(pairs))
+            pairs.append((initial, final))
+            if self._checkpoint_interval and len(pairs) % self._checkpoint_interval == 0:
+                checkpoints.append(game.to_bytes())
+
+        record = pack_moves(pairs) + b''.join(checkpoints)
+        self._data.write(record)
+        self._index.write(_INDEX_ENTRY.pack(self._offset, len(pairs)))
+        self._offset += len(record)
+
+    def close(self):
+        """
+        Flushes and closes both files
+        """
+        self._data.close()
+        self._index.close()
+
+
+class GameStore:
+    """
+    Class for reading a store. Games are numbered from 0 in the order they
+    were added.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as data_file:
+            self._data_map = mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(index_path(path), 'rb') as index_file:
+            self._index_map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._data = memoryview(self._data_map)
+        self._index = memoryview(self._index_map)
+
+        magic, version, self._checkpoint_interval = _DATA_HEADER.unpack_from(self._data)
+        if magic != DATA_MAGIC or version != VERSION:
+            raise ValueError('%s is not a game store' % path)
+        if _INDEX_HEADER.unpack_from(self._index)[0] != INDEX_MAGIC:
+            raise ValueError('%s is not a game store index' % index_path(path))
+        # a game being appended while the store is open may only have part
+        # of its entry written, so only whole entries are counted
+        self._game_count = (len(self._index) - _INDEX_HEADER.size) // _INDEX_ENTRY.size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._game_count
+
+    def get_game_count(self):
+        """
+        Returns how many games are in the store
+        """
+        return self._game_count
+
+    def get_checkpoint_interval(self):
+        """
+        Returns how many moves there are between checkpoints, 0 for none
+        """
+        return self._checkpoint_interval
+
+    def _entry(self, game):
+        """
+        Returns the offset and move count of a game
+        """
+        if not 0 <= game < self._game_count:
+            raise IndexError('game %d is not in the store' % game)
+        return _INDEX_ENTRY.unpack_from(self._index, _INDEX_HEADER.size + game * _INDEX_ENTRY.size)
+
+    def get_move_count(self, game):
+        """
+        Returns how many moves a game has
+        """
+        return self._entry(game)[1]
+
+    def get_moves(self, game):
+        """
+        Returns the moves of a game as a list of (initial, final) pairs
+        """
+        offset, move_count = self._entry(game)
+        return unpack_moves(self._data[offset:offset + packed_size(move_count)], move_count)
+
+    def position(self, game, ply=None):
+        """
+        Returns a new ChessVar at a game after ply moves, or after its last
+        move if no ply is given. Starts from the nearest checkpoint at or
+        before the ply and makes the rest of the moves from there
+        """
+        offset, move_count = self._entry(game)
+        if ply is None:
+            ply = move_count
+        if not 0 <= ply <= move_count:
+            raise IndexError('game %d has %d moves, not %d' % (game, move_count, ply))
+
+        moves = self._data[offset:offset + packed_size(move_count)]
+        checkpoint = ply // self._checkpoint_interval if self._checkpoint_interval else 0
+        if checkpoint:
+            start = offset + packed_size(move_count) + (checkpoint - 1) * CHECKPOINT_SIZE
+            position = ChessVar.from_bytes(self._data[start:start + CHECKPOINT_SIZE])
+            first = checkpoint * self._checkpoint_interval
+        else:
+            position = ChessVar()
+            first = 0
+
+        for number in range(first, ply):
+            initial, final = unpack_move(moves, number)
+            if not position.make_move(SQUARE_NAMES[initial], SQUARE_NAMES[final]):
+                raise ValueError('game %d has an illegal move at %d' % (game, number))
+        return position
+
+    def close(self):
+        """
+        Releases the views and closes the maps
+        """
+        self._data.release()
+        self._index.release()
+        self._data_map.close()
+        self._index_map.close()
+
+
+def main(argv=None):
+    """
+    Builds a store from a text archive of one game per line, or prints a
+    position from a store
+    """
+    parser = argparse.ArgumentParser(description='Build or read a ChessVar game store.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='append the games in a text archive to a store')
+    build.add_argument('archive')
+    build.add_argument('store')
+    build.add_argument('--checkpoint', type=int, default=16,
+                       help='moves between checkpoints, 0 for none')
+    show = commands.add_parser('show', help='print the position of a game at a ply')
+    show.add_argument('store')
+    show.add_argument('game', type=int)
+    show.add_argument('ply', type=int, nargs='?')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        added = 0
+        skipped = 0
+        with GameStoreWriter(args.store, args.checkpoint) as writer, open(args.archive) as archive:
+            for line in archive:
+                try:
+                    writer.add_game(line.split())
+                except ValueError:
+                    skipped += 1
+                else:
+                    added += 1
+        print('added %d games, skipped %d with illegal moves' % (added, skipped))
+        return 0
+
+    with GameStore(args.store) as store:
+        game = store.position(args.game, args.ply)
+        print(game.to_fen())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,178 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: A load test client for server.py. Plays many simulated games
+#                at once against a running game server on localhost, picking
+#                a random legal move for each side, and reports the p50 and p99
+#                latency of the move requests. Games are spread over a number
+#                of connections and each connection sends requests for many
+#                games at once, matching replies to requests by their id. Only
+#                a set number of games are played at the same time so the
+#                latency is not just time spent waiting in the client.
+#
+#                Usage: python loadtest.py [--games 10000] [--connections 100]
+#                                          [--concurrency 500] [--plies 20]
+#                                          [--seed 0]
+#                                          [--port 8162] [--start-server]
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from server import DEFAULT_HOST, DEFAULT_PORT, GameServer
+
+
+class Connection:
+    """
+    Class for one client connection that can have many requests waiting
+    for replies at the same time
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting = {}
+        self._reading = asyncio.ensure_future(self._read_replies())
+
+    @classmethod
+    async def open(cls, host, port):
+        """
+        Connects to the server and returns a Connection
+        """
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, **request):
+        """
+        Sends a request and waits for its reply
+        """
+        request_id = next(self._ids)
+        request['id'] = request_id
+        reply = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = reply
+        self._writer.write(json.dumps(request).encode() + b'\n')
+        await self._writer.drain()
+        return await reply
+
+    async def _read_replies(self):
+        """
+        Reads reply lines and hands each one to the request waiting for it
+        """
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            reply = json.loads(line)
+            waiting = self._waiting.pop(reply.get('id'), None)
+            if waiting is not None:
+                waiting.set_result(reply)
+        for waiting in self._waiting.values():
+            waiting.set_exception(ConnectionError('the server closed the connection'))
+
+    async def close(self):
+        """
+        Closes the connection
+        """
+        self._reading.cancel()
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def play_game(connection, rng, plies, latencies):
+    """
+    Creates a game on the server and plays random legal moves until it
+    ends or the ply limit is reached, adding each move's latency in
+    seconds to latencies
+    """
+    game_id = (await connection.request(op='create'))['game']
+    for _ in range(plies):
+        moves = (await connection.request(op='moves', game=game_id))['moves']
+        if not moves:
+            break
+        move = rng.choice(moves)
+        start = time.perf_counter()
+        reply = await connection.request(op='move', game=game_id, **{'from': move[:2], 'to': move[2:]})
+        latencies.append(time.perf_counter() - start)
+        if reply['state'] != 'UNFINISHED':
+            break
+    await connection.request(op='close', game=game_id)
+
+
+def percentile(values, fraction):
+    """
+    Returns the value at the fraction (0 to 1) of the sorted values
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(games=10000, connections=100, concurrency=500, plies=20, seed=0,
+              host=DEFAULT_HOST, port=DEFAULT_PORT, start_server=False):
+    """
+    Runs the load test and returns a dictionary of the results
+    """
+    game_server = None
+    if start_server:
+        game_server = GameServer()
+        await game_server.start(host, port)
+
+    rng = random.Random(seed)
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+    opened = [await Connection.open(host, port) for _ in range(connections)]
+
+    async def play(number, game_rng):
+        async with slots:
+            await play_game(opened[number % connections], game_rng, plies, latencies)
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(play(number, random.Random(rng.getrandbits(64)))
+                               for number in range(games)))
+    finally:
+        seconds = time.perf_counter() - start
+        for connection in opened:
+            await connection.close()
+        if game_server is not None:
+            await game_server.stop()
+
+    return {'games': games,
+            'moves': len(latencies),
+            'seconds': seconds,
+            'moves_per_second': len(latencies) / seconds if seconds > 0 else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000}
+
+
+def main(argv=None):
+    """
+    Runs the load test from the command line and prints the results
+    """
+    parser = argparse.ArgumentParser(description='Load test the ChessVar game server.')
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--connections', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=500,
+                        help='how many games are played at the same time')
+    parser.add_argument('--plies', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--start-server', action='store_true',
+                        help='run a server in the same process instead of connecting to one')
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(run(args.games, args.connections, args.concurrency, args.plies, args.seed,
+                              args.host, args.port, args.start_server))
+    print('%d games, %d moves in %.2fs (%.0f moves/sec)'
+          % (results['games'], results['moves'], results['seconds'], results['moves_per_second']))
+    print('move latency p50 %.2fms p99 %.2fms' % (results['p50_ms'], results['p99_ms']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,376 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: A Monte Carlo tree search player for ChessVar. Instead of
+#                scoring positions it plays many quick games (playouts) from
+#                the position using a simple move policy from selfplay.py and
+#                grows a tree of the moves that win most often, picking which
+#                move to look at next with UCT. Playouts work on square indexes
+#                with generate_moves and apply_move on clones of the game, so
+#                no move strings are handled. The tree is kept between moves
+#                and reused when the game reaches a position that is already
+#                in it, and playouts can be run in a process pool. The stats of
+#                each search include the playouts per second.
+#
+#                Usage: python mcts.py [--playouts 2000] [--workers N]
+#                                      [--policy greedy] [--seed 0]
+
+import argparse
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessVar import ChessVar, SQUARE_NAMES
+
+# the UCT exploration constant
+EXPLORATION = 1.4
+
+# how many moves a playout makes before it is counted as a draw
+ROLLOUT_LIMIT = 200
+
+
+def rollout(game, rng, policy, limit=ROLLOUT_LIMIT):
+    """
+    Plays moves from the policy on the game until it ends, the side to
+    move has no moves or the limit is reached, and returns the final game
+    state. The game is changed, so it should be a clone
+    """
+    for _ in range(limit):
+        if game.get_game_state() != 'UNFINISHED':
+            break
+        move = policy(game, rng)
+        if move is None:
+            break
+        game.apply_move(move[0], move[1])
+    return game.get_game_state()
+
+
+def rollout_batch(packed, count, seed, policy_name, limit=ROLLOUT_LIMIT):
+    """
+    Plays count playouts from a position packed with to_bytes, for running
+    in a worker process. Returns the number of white wins, black wins and
+    draws
+    """
+    from selfplay import POLICIES
+
+    policy = POLICIES[policy_name]
+    rng = random.Random(seed)
+    position = ChessVar.from_bytes(packed)
+    wins = {'WHITE_WON': 0, 'BLACK_WON': 0, 'UNFINISHED': 0}
+    for _ in range(count):
+        wins[rollout(position.clone(), rng, policy, limit)] += 1
+    return wins['WHITE_WON'], wins['BLACK_WON'], wins['UNFINISHED']
+
+
+class _Node:
+    """
+    Class for one position in the search tree, reached by a move made by
+    color. wins counts the playouts through the node that color won, with
+    a draw counting as half a win
+    """
+
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'wins', 'color', 'hash')
+
+    def __init__(self, move, parent, game, rng):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = list(game.generate_moves())
+        rng.shuffle(self.untried)
+        self.visits = 0
+        self.wins = 0.0
+        # the color that made the move into this position
+        self.color = 'black' if game.get_turn() == 'white' else 'white'
+        self.hash = game.position_hash()
+
+
+class MCTSResult:
+    """
+    Class holding the move picked by a search and how the search went
+    """
+
+    def __init__(self, move, visits, win_rate, playouts, reused, seconds):
+        self._move = move
+        self._visits = visits
+        self._win_rate = win_rate
+        self._playouts = playouts
+        self._reused = reused
+        self._seconds = seconds
+
+    def get_move(self):
+        """
+        Returns the picked move as a pair of spots, ex ('a2', 'a4'), or None
+        if the side to move has no moves
+        """
+        return self._move
+
+    def get_visits(self):
+        """
+        Returns how many playouts went through the picked move
+        """
+        return self._visits
+
+    def get_win_rate(self):
+        """
+        Returns the share of playouts through the picked move that the side
+        to move won, with draws counted as half
+        """
+        return self._win_rate
+
+    def get_playouts(self):
+        """
+        Returns how many playouts the search ran
+        """
+        return self._playouts
+
+    def get_reused(self):
+        """
+        Returns how many playouts from earlier searches were kept in the tree
+        """
+        return self._reused
+
+    def get_seconds(self):
+        """
+        Returns how long the search took in seconds
+        """
+        return self._seconds
+
+    def get_playouts_per_second(self):
+        """
+        Returns how many playouts were run per second
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return self._playouts / self._seconds
+
+
+class MCTSPlayer:
+    """
+    Class for a Monte Carlo tree search player. The tree from the last
+    search is kept so a later search from a position in it starts with
+    the playouts already done there.
+    """
+
+    def __init__(self, playouts=2000, time_limit=None, exploration=EXPLORATION,
+                 policy='greedy', rollout_limit=ROLLOUT_LIMIT, workers=1,
+                 batch_size=8, seed=0):
+        from selfplay import POLICIES
+
+        self._playouts = playouts
+        self._time_limit = time_limit
+        self._exploration = exploration
+        self._policy_name = policy
+        self._policy = POLICIES[policy]
+        self._rollout_limit = rollout_limit
+        self._workers = workers
+        self._batch_size = batch_size
+        self._rng = random.Random(seed)
+        self._root = None
+        self._pool = None
+        self._last_result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_last_result(self):
+        """
+        Returns the MCTSResult of the last search, or None
+        """
+        return self._last_result
+
+    def clear(self):
+        """
+        Throws away the saved tree
+        """
+        self._root = None
+
+    def close(self):
+        """
+        Shuts down the process pool if one was started
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def best_move(self, game):
+        """
+        Returns the move picked for the side to move as a pair of spots
+        """
+        return self.search(game).get_move()
+
+    def search(self, game):
+        """
+        Runs playouts from the game's position until the playout budget or
+        the time limit runs out and returns an MCTSResult for the move
+        with the most playouts. The game is not changed
+        """
+        start = time.perf_counter()
+        root = self._find_root(game)
+        reused = root.visits
+        if root.untried or root.children:
+            if self._workers > 1:
+                playouts = self._search_parallel(root, game, start)
+            else:
+                playouts = self._search_serial(root, game, start)
+        else:
+            playouts = 0
+        seconds = time.perf_counter() - start
+
+        self._root = root
+        if not root.children:
+            self._last_result = MCTSResult(None, 0, 0.0, playouts, reused, seconds)
+            return self._last_result
+        best = max(root.children, key=lambda child: child.visits)
+        self._last_result = MCTSResult((SQUARE_NAMES[best.move[0]], SQUARE_NAMES[best.move[1]]),
+                                       best.visits, best.wins / best.visits if best.visits else 0.0,
+                                       playouts, reused, seconds)
+        return self._last_result
+
+    def _find_root(self, game):
+        """
+        Returns the node for the game's position from the saved tree, looking
+        at the old root and two moves past it, or a new node if it is not there
+        """
+        position_hash = game.position_hash()
+        old = self._root
+        if old is not None:
+            for node in [old] + old.children + [grandchild for child in old.children
+                                                for grandchild in child.children]:
+                if node.hash == position_hash:
+                    node.parent = None
+                    node.move = None
+                    return node
+        return _Node(None, None, game, self._rng)
+
+    def _out_of_budget(self, playouts, start):
+        """
+        Returns True once the playout budget or the time limit is used up
+        """
+        if self._time_limit is not None and time.perf_counter() - start >= self._time_limit:
+            return True
+        return self._playouts is not None and playouts >= self._playouts
+
+    def _select(self, root, game):
+        """
+        Goes down the tree from the root picking children by UCT, making
+        each move on a clone of the game, and adds one new child if the
+        node reached still has untried moves. Returns the node and the clone
+        """
+        position = game.clone()
+        node = root
+        exploration = self._exploration
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            best = None
+            best_value = -1.0
+            for child in node.children:
+                value = (child.wins / child.visits
+                         + exploration * math.sqrt(log_visits / child.visits))
+                if value > best_value:
+                    best = child
+                    best_value = value
+            node = best
+            position.apply_move(node.move[0], node.move[1])
+        if node.untried:
+            move = node.untried.pop()
+            position.apply_move(move[0], move[1])
+            child = _Node(move, node, position, self._rng)
+            node.children.append(child)
+            node = child
+        return node, position
+
+    def _backpropagate(self, node, white, black, draws, visits=None):
+        """
+        Adds playout results to the node and every node above it
+        """
+        if visits is None:
+            visits = white + black + draws
+        while node is not None:
+            node.visits += visits
+            node.wins += (white if node.color == 'white' else black) + draws * 0.5
+            node = node.parent
+
+    def _search_serial(self, root, game, start):
+        """
+        Runs one playout at a time in this process. Returns how many ran
+        """
+        playouts = 0
+        rng = self._rng
+        while not self._out_of_budget(playouts, start):
+            node, position = self._select(root, game)
+            state = rollout(position, rng, self._policy, self._rollout_limit)
+            self._backpropagate(node, state == 'WHITE_WON', state == 'BLACK_WON',
+                                state == 'UNFINISHED')
+            playouts += 1
+        return playouts
+
+    def _search_parallel(self, root, game, start):
+        """
+        Picks a few leaves at a time and sends each to the process pool for
+        a batch of playouts. A leaf that has been picked counts as a visit
+        with no wins until its results come back, so the leaves picked in
+        one round are spread out. Returns how many playouts ran
+        """
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self._workers)
+        playouts = 0
+        while not self._out_of_budget(playouts, start):
+            jobs = []
+            # batches are cut down so the search stops at the playout budget
+            remaining = None if self._playouts is None else self._playouts - playouts
+            for _ in range(self._workers * 2):
+                count = self._batch_size
+                if remaining is not None:
+                    count = min(count, remaining)
+                    if count <= 0:
+                        break
+                    remaining -= count
+                node, position = self._select(root, game)
+                self._backpropagate(node, 0, 0, 0, visits=1)
+                if position.get_game_state() != 'UNFINISHED':
+                    jobs.append((node, None, position.get_game_state(), count))
+                else:
+                    jobs.append((node, self._pool.submit(
+                        rollout_batch, position.to_bytes(), count,
+                        self._rng.getrandbits(64), self._policy_name, self._rollout_limit),
+                        None, count))
+            for node, job, state, count in jobs:
+                if job is None:
+                    white = count if state == 'WHITE_WON' else 0
+                    black = count if state == 'BLACK_WON' else 0
+                    draws = 0
+                else:
+                    white, black, draws = job.result()
+                    count = white + black + draws
+                # the visit added when the leaf was picked is taken back out
+                self._backpropagate(node, white, black, draws, visits=count - 1)
+                playouts += count
+        return playouts
+
+
+def main(argv=None):
+    """
+    Searches the starting position from the command line and prints the
+    move picked and the playout rate
+    """
+    parser = argparse.ArgumentParser(description='Pick a ChessVar move with Monte Carlo tree search.')
+    parser.add_argument('--playouts', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--policy', choices=('random', 'greedy'), default='greedy')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with MCTSPlayer(args.playouts, policy=args.policy, workers=args.workers, seed=args.seed) as player:
+        result = player.search(ChessVar())
+    print('move %s%s, %d visits, win rate %.2f'
+          % (result.get_move()[0], result.get_move()[1], result.get_visits(), result.get_win_rate()))
+    print('%d playouts in %.2fs (%.0f playouts/sec)'
+          % (result.get_playouts(), result.get_seconds(), result.get_playouts_per_second()))
+
+
+if __name__ == '__main__':
+    main()
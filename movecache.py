@@ -0,0 +1,122 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: A least recently used cache for move checks that ChessVar games
+#                can share, turned on by passing one to ChessVar(cache=...) or
+#                set_cache. It remembers whether a move is valid and the full
+#                list of legal moves for a position, keyed by the position's
+#                Zobrist hash, so the same popular positions (like the opening
+#                moves) are only worked out once. Since the hash changes with
+#                every move nothing has to be cleared when a move is made. The
+#                cache is kept under a number of entries and a rough number of
+#                bytes by dropping the least recently used entries, and counts
+#                its hits, misses and evictions.
+
+import collections
+import sys
+
+# roughly how many bytes the ordered dictionary uses to hold one entry
+_ENTRY_OVERHEAD = 100
+# the size of one (initial, final) move tuple in a cached move list
+_MOVE_SIZE = sys.getsizeof((0, 0))
+
+
+class MoveCache:
+    """
+    Class for a bounded cache of move checks and legal move lists. Keys
+    are (position hash, initial, final) for a move check and (position
+    hash, None, None) for the legal moves of a position.
+    """
+
+    def __init__(self, max_entries=100000, max_bytes=64 * 1024 * 1024):
+        self._entries = collections.OrderedDict()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Returns the value saved for the key, or None if it is not cached.
+        A hit moves the entry to the most recently used end
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return value[0]
+
+    def put(self, key, value):
+        """
+        Saves a value for the key, then drops the least recently used
+        entries until the cache is back under both of its limits
+        """
+        size = _ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(key[0])
+        if isinstance(value, tuple):
+            size += sys.getsizeof(value) + len(value) * _MOVE_SIZE
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._entries[key] = (value, size)
+        self._bytes += size
+
+        entries = self._entries
+        while len(entries) > self._max_entries or (self._bytes > self._max_bytes and entries):
+            self._bytes -= entries.popitem(last=False)[1][1]
+            self._evictions += 1
+
+    def valid_move(self, position_hash, initial, final):
+        """
+        Returns True or False if the move check is cached, otherwise None
+        """
+        return self.get((position_hash, initial, final))
+
+    def put_valid_move(self, position_hash, initial, final, valid):
+        """
+        Saves whether a move is valid in a position
+        """
+        self.put((position_hash, initial, final), valid)
+
+    def moves(self, position_hash):
+        """
+        Returns the cached tuple of legal moves for a position, or None
+        """
+        return self.get((position_hash, None, None))
+
+    def put_moves(self, position_hash, moves):
+        """
+        Saves the tuple of legal moves for a position
+        """
+        self.put((position_hash, None, None), tuple(moves))
+
+    def get_stats(self):
+        """
+        Returns a dictionary of the hit, miss and eviction counts, the hit
+        rate, and how many entries and rough bytes are in the cache
+        """
+        lookups = self._hits + self._misses
+        return {'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self._max_entries,
+                'max_bytes': self._max_bytes}
+
+    def clear(self):
+        """
+        Empties the cache and resets the counts
+        """
+        self._entries.clear()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
@@ -0,0 +1,234 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: Perft (performance test) for the ChessVar move rules. Counts
+#                every position reachable to a given depth from the starting
+#                board and from a set of test positions, along with how many
+#                of the moves at each depth were captures, ended the game or
+#                won it for white. The counts are checked against the golden
+#                counts saved in perft_golden.json so any change to the rules
+#                or a faster engine can be checked to give exactly the same
+#                results. --check-attacks also makes sure the attack maps kept
+#                up to date on every move and take back match attack maps made
+#                from the board, which makes the run much slower.
+#
+#                Usage: python perft.py [--depth N] [--position NAME]
+#                                       [--engine bitboard] [--check]
+#                                       [--check-attacks] [--update]
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from ChessVar import ChessVar
+
+GOLDEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perft_golden.json')
+
+# test positions, each reached by playing the moves from the starting board,
+# or given as a to_fen string
+TEST_POSITIONS = {
+    'start': (),
+    'rook_lift': ('a2a4', 'h7h5', 'a1a3', 'h8h6', 'a3d3', 'h6c6'),
+    'open_center': ('e2e4', 'd7d5', 'd2d4', 'e7e5', 'd4e5', 'd5e4'),
+    'last_queen': ('e2e4', 'e7e5', 'd1h5', 'a7a6', 'h5f7', 'a6a5'),
+    # both colors are missing a type, so the order update_game_state checks
+    # the types in decides who has won after any move
+    'both_missing': 'rnbqkbnr/8/8/8/8/8/PPPPPPPP/1NBQKBN1 w - UNFINISHED',
+}
+
+
+class PerftResult:
+    """
+    Class holding the counts from a perft run for each depth, starting
+    from depth 1 (the moves from the position itself)
+    """
+
+    def __init__(self, depth):
+        self._nodes = [0] * depth
+        self._captures = [0] * depth
+        self._game_ends = [0] * depth
+        self._white_wins = [0] * depth
+        self._attack_map_errors = 0
+        self._seconds = 0.0
+
+    def get_nodes(self, depth=None):
+        """
+        Returns the number of positions at the depth, or at the deepest
+        depth if none is given
+        """
+        if depth is None:
+            depth = len(self._nodes)
+        return self._nodes[depth - 1]
+
+    def get_attack_map_errors(self):
+        """
+        Returns how many times the attack maps did not match maps made from
+        the board, if they were checked
+        """
+        return self._attack_map_errors
+
+    def get_seconds(self):
+        """
+        Returns how long the run took in seconds
+        """
+        return self._seconds
+
+    def get_nodes_per_second(self):
+        """
+        Returns how many positions were visited per second
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return sum(self._nodes) / self._seconds
+
+    def to_dict(self):
+        """
+        Returns the counts for every depth as a dictionary keyed by depth
+        """
+        return {str(depth + 1): {'nodes': self._nodes[depth],
+                                 'captures': self._captures[depth],
+                                 'game_ends': self._game_ends[depth],
+                                 'white_wins': self._white_wins[depth]}
+                for depth in range(len(self._nodes))}
+
+
+def perft(game, depth, check_attacks=False):
+    """
+    Counts every position reachable from the game in exactly depth moves
+    and returns a PerftResult with the count, captures and game ending moves
+    at each depth. A game that is over has no moves, so a line stops there.
+    With check_attacks the game's attack maps are checked against maps made
+    from the board after every move and take back. The game is left the
+    way it was
+    """
+    result = PerftResult(depth)
+    start = time.perf_counter()
+    if check_attacks and not game.attack_maps_match():
+        result._attack_map_errors += 1
+    if depth > 0:
+        _perft(game, depth, 0, result, check_attacks)
+    result._seconds = time.perf_counter() - start
+    return result
+
+
+def _perft(game, depth, ply, result, check_attacks=False):
+    """
+    Plays every move from the position and adds it to the counts for the
+    next ply, going deeper until the depth runs out
+    """
+    nodes = result._nodes
+    captures = result._captures
+    game_ends = result._game_ends
+    white_wins = result._white_wins
+    for initial, final in list(game.generate_moves()):
+        nodes[ply] += 1
+        if game.piece_at(final) is not None:
+            captures[ply] += 1
+        game.push_indexes(initial, final)
+        if check_attacks and not game.attack_maps_match():
+            result._attack_map_errors += 1
+        state = game.get_game_state()
+        if state != 'UNFINISHED':
+            game_ends[ply] += 1
+            if state == 'WHITE_WON':
+                white_wins[ply] += 1
+        elif depth > 1:
+            _perft(game, depth - 1, ply + 1, result, check_attacks)
+        game.pop_move()
+        if check_attacks and not game.attack_maps_match():
+            result._attack_map_errors += 1
+
+
+def divide(game, depth):
+    """
+    Returns a dictionary of the leaf count under each move from the game,
+    keyed by the move written like 'a2a4'. Useful for finding which move
+    a count difference comes from
+    """
+    counts = {}
+    for initial, final in game.legal_moves():
+        game.push_move(initial, final)
+        if depth > 1:
+            counts[initial + final] = perft(game, depth - 1).get_nodes()
+        else:
+            counts[initial + final] = 1
+        game.pop_move()
+    return counts
+
+
+def position(name, engine='mailbox'):
+    """
+    Returns a new game set up at one of the test positions
+    """
+    moves = TEST_POSITIONS[name]
+    if isinstance(moves, str):
+        return ChessVar.from_fen(moves, engine)
+    game = ChessVar(engine=engine)
+    for move in moves:
+        if not game.make_move(move[:2], move[2:]):
+            raise ValueError('test position %s has an illegal move %s' % (name, move))
+    return game
+
+
+def load_golden(path=GOLDEN_FILE):
+    """
+    Returns the golden counts saved in the repo, keyed by position name
+    """
+    with open(path) as golden_file:
+        return json.load(golden_file)
+
+
+def main(argv=None):
+    """
+    Runs perft from the command line and prints the counts for each depth
+    """
+    parser = argparse.ArgumentParser(description='Count move tree leaves for ChessVar.')
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--position', choices=sorted(TEST_POSITIONS), action='append',
+                        help='test position to run, can be given more than once (default all)')
+    parser.add_argument('--engine', choices=('mailbox', 'bitboard'), default='mailbox')
+    parser.add_argument('--check', action='store_true',
+                        help='compare the counts to perft_golden.json')
+    parser.add_argument('--check-attacks', action='store_true',
+                        help='check the attack maps against the board after every move')
+    parser.add_argument('--update', action='store_true',
+                        help='save the counts to perft_golden.json')
+    args = parser.parse_args(argv)
+
+    names = args.position or list(TEST_POSITIONS)
+    golden = load_golden() if (args.check or args.update) and os.path.exists(GOLDEN_FILE) else {}
+    failed = False
+
+    for name in names:
+        result = perft(position(name, args.engine), args.depth, args.check_attacks)
+        counts = result.to_dict()
+        print('%s (%.0f nodes/sec)' % (name, result.get_nodes_per_second()))
+        for depth, count in counts.items():
+            print('  depth %s: %d nodes, %d captures, %d game ends, %d white wins'
+                  % (depth, count['nodes'], count['captures'], count['game_ends'],
+                     count['white_wins']))
+
+        if args.check:
+            expected = golden.get(name, {})
+            for depth, count in counts.items():
+                if depth in expected and expected[depth] != count:
+                    print('  MISMATCH at depth %s, expected %s' % (depth, expected[depth]))
+                    failed = True
+        if result.get_attack_map_errors():
+            print('  ATTACK MAPS did not match the board %d times' % result.get_attack_map_errors())
+            failed = True
+        if args.update:
+            golden.setdefault(name, {}).update(counts)
+
+    if args.update:
+        with open(GOLDEN_FILE, 'w') as golden_file:
+            json.dump(golden, golden_file, indent=2, sort_keys=True)
+            golden_file.write('\n')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
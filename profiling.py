@@ -0,0 +1,128 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: Optional timing of ChessVar.make_move, turned on by passing a
+#                Profiler to ChessVar(profiler=...) or set_profiler. A game
+#                without one runs exactly as before apart from a few checks.
+#                With one, make_move goes through the same find_move and move
+#                code as without, passing the profiler in, so each stage of the
+#                move really made is timed once: the bounds check
+#                (check_bounds), the piece's move rules (valid_move_<type>), the
+#                board update (move_piece) and update_game_state, along with
+#                the whole of find_move and make_move. It also counts why
+#                rejected moves were rejected using the reason find_move saves.
+#                The counts, total times and p50, p90 and p99 of the recent
+#                timings can be read as a dictionary or as Prometheus text. One
+#                Profiler can be shared by many games.
+
+import collections
+
+# why make_move turned down a move
+REJECTION_REASONS = ('game_over', 'out_of_bounds', 'empty_square', 'own_piece_capture',
+                     'wrong_turn', 'illegal_geometry')
+
+# the quantiles reported for each stage
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def quantile(ordered, fraction):
+    """
+    Returns the value at the fraction (0 to 1) of a sorted list
+    """
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Profiler:
+    """
+    Class that collects the stage timings and rejection counts of the games
+    using it. Only the last window timings of each stage are kept for the
+    quantiles, the counts and totals cover every call.
+    """
+
+    def __init__(self, window=4096):
+        self._window = window
+        self._counts = collections.Counter()
+        self._totals = collections.Counter()
+        self._samples = {}
+        self._rejections = dict.fromkeys(REJECTION_REASONS, 0)
+        self._accepted = 0
+
+    def record(self, stage, seconds):
+        """
+        Adds one timing in seconds for a stage
+        """
+        self._counts[stage] += 1
+        self._totals[stage] += seconds
+        samples = self._samples.get(stage)
+        if samples is None:
+            samples = self._samples[stage] = collections.deque(maxlen=self._window)
+        samples.append(seconds)
+
+    def reject(self, reason):
+        """
+        Counts a move turned down for a reason from REJECTION_REASONS
+        """
+        self._rejections[reason] += 1
+
+    def accept(self):
+        """
+        Counts a move that was made
+        """
+        self._accepted += 1
+
+    def snapshot(self):
+        """
+        Returns a dictionary of the accepted and rejected move counts, the
+        count of each rejection reason, and for each stage its call count,
+        total and mean seconds and the quantiles of the recent timings
+        """
+        stages = {}
+        for stage in sorted(self._counts):
+            ordered = sorted(self._samples[stage])
+            count = self._counts[stage]
+            stats = {'count': count,
+                     'total_seconds': self._totals[stage],
+                     'mean_seconds': self._totals[stage] / count}
+            for fraction in QUANTILES:
+                stats['p%g' % (fraction * 100)] = quantile(ordered, fraction)
+            stages[stage] = stats
+        return {'accepted': self._accepted,
+                'rejected': sum(self._rejections.values()),
+                'rejections': dict(self._rejections),
+                'stages': stages}
+
+    def to_prometheus(self, prefix='chessvar'):
+        """
+        Returns the snapshot in the Prometheus text format, with the stage
+        timings as a summary and the moves as counters
+        """
+        snapshot = self.snapshot()
+        lines = ['# HELP %s_moves_total Moves given to make_move by result.' % prefix,
+                 '# TYPE %s_moves_total counter' % prefix,
+                 '%s_moves_total{result="accepted"} %d' % (prefix, snapshot['accepted']),
+                 '%s_moves_total{result="rejected"} %d' % (prefix, snapshot['rejected']),
+                 '# HELP %s_rejections_total Moves turned down by make_move by reason.' % prefix,
+                 '# TYPE %s_rejections_total counter' % prefix]
+        for reason, count in snapshot['rejections'].items():
+            lines.append('%s_rejections_total{reason="%s"} %d' % (prefix, reason, count))
+        lines.append('# HELP %s_stage_seconds Time spent in each stage of make_move.' % prefix)
+        lines.append('# TYPE %s_stage_seconds summary' % prefix)
+        for stage, stats in snapshot['stages'].items():
+            for fraction in QUANTILES:
+                lines.append('%s_stage_seconds{stage="%s",quantile="%g"} %.9g'
+                             % (prefix, stage, fraction, stats['p%g' % (fraction * 100)]))
+            lines.append('%s_stage_seconds_sum{stage="%s"} %.9g' % (prefix, stage, stats['total_seconds']))
+            lines.append('%s_stage_seconds_count{stage="%s"} %d' % (prefix, stage, stats['count']))
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """
+        Clears every count and timing
+        """
+        self._counts.clear()
+        self._totals.clear()
+        self._samples.clear()
+        self._rejections = dict.fromkeys(REJECTION_REASONS, 0)
+        self._accepted = 0
@@ -0,0 +1,156 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: Replays archives of ChessVar games to check them. An archive is
+#                a text file with one game per line written as space separated
+#                moves like "a2a4 b7b5". Files are read one line at a time so
+#                memory stays the same however big the archive is, and blank
+#                lines are skipped. Each game is replayed with make_move and
+#                gives a result with its file and line number in that file,
+#                final game state, the index of its first illegal move (or
+#                None) and how many moves were made. Chunks of lines can be
+#                replayed in worker processes, with only a few chunks in flight
+#                at once, and the results still come back in file order.
+#
+#                Usage: python replay.py ARCHIVE [ARCHIVE ...] [--workers N]
+#                                        [--chunk-size 2000] [--output FILE]
+
+import argparse
+import collections
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ChessVar import ChessVar, GAME_STATES
+
+
+def replay_line(line, line_number=0, path=None):
+    """
+    Replays one line of moves from the starting board. Returns a tuple of
+    (archive path, line number, final game state, index of the first
+    illegal move or None, number of moves made). Replaying stops at the
+    first move that is not legal, including any move after the game is over
+    """
+    game = ChessVar()
+    moves = line.split()
+    for index, move in enumerate(moves):
+        if len(move) != 4 or not game.make_move(move[:2], move[2:]):
+            return path, line_number, game.get_game_state(), index, index
+    return path, line_number, game.get_game_state(), None, len(moves)
+
+
+def replay_chunk(lines, path=None):
+    """
+    Replays a list of (line number, line) pairs from one archive
+    """
+    return [replay_line(line, line_number, path) for line_number, line in lines]
+
+
+def read_lines(paths):
+    """
+    Yields (path, line number, line) for every line of each archive in
+    turn, one at a time. The lines of each archive are numbered from 1.
+    Blank lines are skipped, they are not games
+    """
+    for path in paths:
+        with open(path) as archive:
+            for line_number, line in enumerate(archive, 1):
+                if line.strip():
+                    yield path, line_number, line
+
+
+def read_chunks(lines, chunk_size):
+    """
+    Groups the (path, line number, line) tuples from read_lines into
+    lists of up to chunk_size (line number, line) pairs from the same
+    archive, yielding each list with its archive path
+    """
+    chunk = []
+    chunk_path = None
+    for path, line_number, line in lines:
+        if chunk and (path != chunk_path or len(chunk) == chunk_size):
+            yield chunk_path, chunk
+            chunk = []
+        if not chunk:
+            chunk_path = path
+        chunk.append((line_number, line))
+    if chunk:
+        yield chunk_path, chunk
+
+
+def replay_lines(lines, workers=1, chunk_size=2000):
+    """
+    Yields the result of every (path, line number, line) tuple in order.
+    With more than one worker the lines are replayed in chunks in a process
+    pool, with at most two chunks per worker read ahead so memory does not
+    grow with the archive
+    """
+    if workers <= 1:
+        for path, line_number, line in lines:
+            yield replay_line(line, line_number, path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = collections.deque()
+        for path, chunk in read_chunks(lines, chunk_size):
+            in_flight.append(pool.submit(replay_chunk, chunk, path))
+            if len(in_flight) >= workers * 2:
+                for result in in_flight.popleft().result():
+                    yield result
+        while in_flight:
+            for result in in_flight.popleft().result():
+                yield result
+
+
+def replay_archives(paths, workers=1, chunk_size=2000):
+    """
+    Yields the result of every game in the archives, in order
+    """
+    return replay_lines(read_lines(paths), workers, chunk_size)
+
+
+def main(argv=None):
+    """
+    Replays archives from the command line, writes each game's result
+    if asked to, and prints a summary
+    """
+    parser = argparse.ArgumentParser(description='Replay and check archives of ChessVar games.')
+    parser.add_argument('archives', nargs='+')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--output', help='file to write one result line per game to')
+    args = parser.parse_args(argv)
+
+    counts = dict.fromkeys(GAME_STATES, 0)
+    games = 0
+    illegal = 0
+    moves = 0
+    output = open(args.output, 'w') if args.output else None
+    start = time.perf_counter()
+    try:
+        for path, line_number, state, illegal_index, move_count in replay_archives(
+                args.archives, args.workers, args.chunk_size):
+            games += 1
+            moves += move_count
+            counts[state] += 1
+            if illegal_index is not None:
+                illegal += 1
+            if output is not None:
+                output.write('%s:%d %s %s %d\n' % (path, line_number, state,
+                                                   '-' if illegal_index is None else illegal_index,
+                                                   move_count))
+    finally:
+        if output is not None:
+            output.close()
+    seconds = time.perf_counter() - start
+
+    print('%d games, %d moves in %.2fs (%.0f moves/sec)'
+          % (games, moves, seconds, moves / seconds if seconds > 0 else 0.0))
+    print('  games with an illegal move: %d' % illegal)
+    for state in GAME_STATES:
+        print('  %-10s %d' % (state, counts[state]))
+    return 1 if illegal else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
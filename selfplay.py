@@ -0,0 +1,248 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: Plays large numbers of ChessVar games between two move policies
+#                (random, greedy capture, the search engine or Monte Carlo tree
+#                search) spread across worker processes. Games are split into
+#                shards that each run in one worker, and finished shards stream
+#                back as compact game records. Every game gets its own seed made
+#                from the starting seed and its game number, so the results are
+#                the same no matter how many workers are used.
+#
+#                Usage: python selfplay.py [--games 1000] [--workers N]
+#                                          [--white random] [--black greedy]
+#                                          [--seed 0] [--max-plies 300]
+#                                          [--output games.txt]
+
+import argparse
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ChessVar import ChessVar, GAME_STATES, PIECE_NAMES, SQUARE_NAMES
+
+# how many shards each worker gets by default, so results stream back while
+# the run goes on and a slow shard does not hold up a whole worker's share
+SHARDS_PER_WORKER = 8
+
+
+def random_policy(game, rng):
+    """
+    Picks any legal move at random
+    """
+    moves = list(game.generate_moves())
+    if not moves:
+        return None
+    return rng.choice(moves)
+
+
+def greedy_policy(game, rng):
+    """
+    Takes the last piece of a type if it can, since that wins the game,
+    otherwise captures the most valuable piece it can, otherwise plays
+    a random move
+    """
+    from engine import PIECE_VALUES
+
+    moves = list(game.generate_moves())
+    if not moves:
+        return None
+    best_moves = []
+    best_value = 0
+    for initial, final in moves:
+        captured = game.piece_at(final)
+        if captured is None:
+            continue
+        if game.get_piece_count(captured.get_color(), captured.get_name()) == 1:
+            return initial, final
+        value = PIECE_VALUES[captured.get_index() % len(PIECE_NAMES)]
+        if value > best_value:
+            best_moves = [(initial, final)]
+            best_value = value
+        elif value == best_value:
+            best_moves.append((initial, final))
+    return rng.choice(best_moves or moves)
+
+
+def engine_policy(game, rng, depth=2):
+    """
+    Plays the move the search engine picks at a fixed depth. A new engine
+    is used for every move so the choice only depends on the position
+    """
+    from engine import Engine
+    from ChessVar import SQUARE_INDEX
+
+    move = Engine().search(game, depth=depth, time_limit=None).get_move()
+    if move is None:
+        return None
+    return SQUARE_INDEX[move[0]], SQUARE_INDEX[move[1]]
+
+
+def mcts_policy(game, rng, playouts=200):
+    """
+    Plays the move the Monte Carlo tree search player picks with a fixed
+    number of playouts, seeded from rng
+    """
+    from mcts import MCTSPlayer
+    from ChessVar import SQUARE_INDEX
+
+    move = MCTSPlayer(playouts, seed=rng.getrandbits(64)).search(game).get_move()
+    if move is None:
+        return None
+    return SQUARE_INDEX[move[0]], SQUARE_INDEX[move[1]]
+
+
+# the move policies that can be picked by name
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'engine': engine_policy,
+    'mcts': mcts_policy,
+}
+
+
+def encode_moves(moves):
+    """
+    Packs a list of (initial, final) square index pairs into bytes, two
+    bytes per move
+    """
+    return bytes(square for move in moves for square in move)
+
+
+def decode_moves(data):
+    """
+    Unpacks bytes from encode_moves back into (initial, final) pairs
+    """
+    return [(data[position], data[position + 1]) for position in range(0, len(data), 2)]
+
+
+def game_seed(seed, number):
+    """
+    Returns the seed for one game from the run's seed and the game number
+    """
+    return random.Random(seed * 1000003 + number).getrandbits(64)
+
+
+def play_game(white, black, seed, max_plies=300):
+    """
+    Plays one game between two policy names and returns the final game
+    state and the moves as a list of square index pairs. A game that
+    reaches max_plies or where the side to move has no moves ends as
+    UNFINISHED
+    """
+    policies = {'white': POLICIES[white], 'black': POLICIES[black]}
+    rng = random.Random(seed)
+    game = ChessVar()
+    moves = []
+    while game.get_game_state() == 'UNFINISHED' and len(moves) < max_plies:
+        move = policies[game.get_turn()](game, rng)
+        if move is None:
+            break
+        game.apply_move(move[0], move[1])
+        moves.append(move)
+    return game.get_game_state(), moves
+
+
+def play_shard(white, black, seed, first, count, max_plies=300):
+    """
+    Plays games first to first + count - 1 in a worker process. Returns
+    a list of (game number, final game state, packed moves) records
+    """
+    records = []
+    for number in range(first, first + count):
+        state, moves = play_game(white, black, game_seed(seed, number), max_plies)
+        records.append((number, state, encode_moves(moves)))
+    return records
+
+
+def self_play(games, white='random', black='random', seed=0, workers=None,
+              max_plies=300, shard_size=None):
+    """
+    Plays the games across a pool of worker processes and yields each
+    game's record as its shard finishes. Records come back in the order
+    shards finish, the game number in each record gives its place
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if shard_size is None:
+        shard_size = max(1, games // (workers * SHARDS_PER_WORKER))
+
+    if workers == 1:
+        for first in range(0, games, shard_size):
+            for record in play_shard(white, black, seed, first,
+                                     min(shard_size, games - first), max_plies):
+                yield record
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = [pool.submit(play_shard, white, black, seed, first,
+                              min(shard_size, games - first), max_plies)
+                  for first in range(0, games, shard_size)]
+        for shard in as_completed(shards):
+            for record in shard.result():
+                yield record
+
+
+def summarize(records):
+    """
+    Adds up the records and returns a dictionary with the count and rate
+    of each game state, the number of games and the average game length
+    """
+    counts = dict.fromkeys(GAME_STATES, 0)
+    games = 0
+    plies = 0
+    for number, state, moves in records:
+        counts[state] += 1
+        games += 1
+        plies += len(moves) // 2
+    return {'games': games,
+            'counts': counts,
+            'rates': {state: counts[state] / games if games else 0.0 for state in GAME_STATES},
+            'average_plies': plies / games if games else 0.0}
+
+
+def format_record(moves):
+    """
+    Writes packed moves as a line of space separated moves like 'a2a4 b7b5'
+    """
+    return ' '.join(SQUARE_NAMES[initial] + SQUARE_NAMES[final]
+                    for initial, final in decode_moves(moves))
+
+
+def main(argv=None):
+    """
+    Runs self play from the command line and prints the results
+    """
+    parser = argparse.ArgumentParser(description='Play ChessVar games between move policies.')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--white', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--black', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-plies', type=int, default=300)
+    parser.add_argument('--output', help='file to write each game to, one line of moves per game')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    records = sorted(self_play(args.games, args.white, args.black, args.seed,
+                               args.workers, args.max_plies))
+    seconds = time.perf_counter() - start
+
+    if args.output:
+        with open(args.output, 'w') as output:
+            for number, state, moves in records:
+                output.write(format_record(moves) + '\n')
+
+    summary = summarize(records)
+    print('%d games in %.2fs (%.1f games/sec), %.1f plies per game'
+          % (summary['games'], seconds, summary['games'] / seconds if seconds > 0 else 0.0,
+             summary['average_plies']))
+    for state in GAME_STATES:
+        print('  %-10s %6d  %5.1f%%' % (state, summary['counts'][state], summary['rates'][state] * 100))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,251 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: An asyncio server that hosts many ChessVar games at once over
+#                TCP. Each request and reply is one line of JSON. Every game
+#                has its own lock so moves to the same game happen one at a
+#                time, games that have not been used for a while are packed
+#                with to_bytes to save memory, and the server stops reading
+#                from a connection while its replies are not being read.
+#
+#                Requests (the optional "id" is sent back in the reply):
+#                  {"op": "create"}
+#                  {"op": "move", "game": 1, "from": "a2", "to": "a4"}
+#                  {"op": "state", "game": 1}
+#                  {"op": "moves", "game": 1}
+#                  {"op": "close", "game": 1}
+#
+#                Usage: python server.py [--host 127.0.0.1] [--port 8162]
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from ChessVar import ChessVar
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8162
+
+
+class GameSession:
+    """
+    Class holding one hosted game. The game is either a live ChessVar or,
+    after it has been idle, the packed bytes from to_bytes
+    """
+
+    def __init__(self, game):
+        self._game = game
+        self._packed = None
+        self._lock = asyncio.Lock()
+        self._last_used = time.monotonic()
+
+    def get_lock(self):
+        """
+        Returns the lock that has to be held while using the game
+        """
+        return self._lock
+
+    def get_game(self):
+        """
+        Returns the live game, unpacking it first if it was evicted
+        """
+        if self._game is None:
+            self._game = ChessVar.from_bytes(self._packed)
+            self._packed = None
+        self._last_used = time.monotonic()
+        return self._game
+
+    def is_evicted(self):
+        """
+        Returns True if the game is only being kept as packed bytes
+        """
+        return self._game is None
+
+    def idle_time(self, now):
+        """
+        Returns how many seconds it has been since the game was used
+        """
+        return now - self._last_used
+
+    def evict(self):
+        """
+        Packs the game into bytes and drops the live ChessVar
+        """
+        if self._game is not None:
+            self._packed = self._game.to_bytes()
+            self._game = None
+
+
+class GameServer:
+    """
+    Class that keeps track of every hosted game and answers requests for
+    them. It can be used on its own with handle_request, or served over
+    TCP with start.
+    """
+
+    def __init__(self, max_games=100000, idle_timeout=60.0, sweep_interval=5.0):
+        self._sessions = {}
+        self._ids = itertools.count(1)
+        self._max_games = max_games
+        self._idle_timeout = idle_timeout
+        self._sweep_interval = sweep_interval
+        self._server = None
+        self._sweeper = None
+
+    def get_game_count(self):
+        """
+        Returns how many games are being hosted
+        """
+        return len(self._sessions)
+
+    def get_evicted_count(self):
+        """
+        Returns how many hosted games are packed because they were idle
+        """
+        return sum(1 for session in self._sessions.values() if session.is_evicted())
+
+    async def handle_request(self, request):
+        """
+        Answers one request dictionary and returns the reply dictionary
+        """
+        op = request.get('op')
+        if op == 'create':
+            if len(self._sessions) >= self._max_games:
+                return {'ok': False, 'error': 'too many games'}
+            game_id = next(self._ids)
+            self._sessions[game_id] = GameSession(ChessVar())
+            return {'ok': True, 'game': game_id}
+
+        game_id = request.get('game')
+        # bool is a subclass of int, so JSON true would otherwise be game 1
+        session = self._sessions.get(game_id) if type(game_id) is int else None
+        if session is None:
+            return {'ok': False, 'error': 'unknown game'}
+
+        if op == 'close':
+            del self._sessions[game_id]
+            return {'ok': True}
+
+        async with session.get_lock():
+            game = session.get_game()
+            if op == 'move':
+                moved = game.make_move(str(request.get('from')), str(request.get('to')))
+                return {'ok': True, 'moved': moved, 'state': game.get_game_state(),
+                        'turn': game.get_turn()}
+            if op == 'state':
+                return {'ok': True, 'state': game.get_game_state(), 'turn': game.get_turn(),
+                        'fen': game.to_fen()}
+            if op == 'moves':
+                return {'ok': True, 'moves': [initial + final for initial, final in game.legal_moves()]}
+        return {'ok': False, 'error': 'unknown op %r' % op}
+
+    def evict_idle(self, now=None):
+        """
+        Packs every game that has been idle longer than the idle timeout
+        and is not in use. Returns how many were packed
+        """
+        if now is None:
+            now = time.monotonic()
+        evicted = 0
+        for session in self._sessions.values():
+            if (not session.is_evicted() and not session.get_lock().locked()
+                    and session.idle_time(now) >= self._idle_timeout):
+                session.evict()
+                evicted += 1
+        return evicted
+
+    async def _sweep(self):
+        """
+        Evicts idle games every sweep interval until cancelled
+        """
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            self.evict_idle()
+
+    async def _handle_connection(self, reader, writer):
+        """
+        Reads request lines from one connection and writes a reply line for
+        each, in order. The next request is not read until the reply has
+        been handed to the socket, and if the client is not reading its
+        replies the write waits for the buffer to drain, so a client that
+        sends too fast is slowed down instead of filling up memory
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('a request must be a JSON object')
+                except ValueError as error:
+                    reply = {'ok': False, 'error': 'bad request: %s' % error}
+                else:
+                    reply = await self.handle_request(request)
+                    if 'id' in request:
+                        reply['id'] = request['id']
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # ValueError is raised for a request line longer than the limit
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Starts listening for connections and the idle game sweeper. Returns
+        the asyncio server
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self._sweeper = asyncio.ensure_future(self._sweep())
+        return self._server
+
+    async def stop(self):
+        """
+        Stops listening and stops the sweeper
+        """
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, **options):
+    """
+    Runs a game server until it is cancelled
+    """
+    game_server = GameServer(**options)
+    server = await game_server.start(host, port)
+    try:
+        await server.serve_forever()
+    finally:
+        await game_server.stop()
+
+
+def main(argv=None):
+    """
+    Runs the game server from the command line
+    """
+    parser = argparse.ArgumentParser(description='Host ChessVar games over TCP.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-games', type=int, default=100000)
+    parser.add_argument('--idle-timeout', type=float, default=60.0,
+                        help='seconds before an unused game is packed')
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, max_games=args.max_games,
+                          idle_timeout=args.idle_timeout))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
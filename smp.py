@@ -0,0 +1,328 @@
+# Author: Harpaul Sidhu
+# GitHub username: hsidhu1332
+# Date: 10/18/2026
+# Description: A parallel search that uses more than one core, in the style of
+#                Lazy SMP. The main search runs in this process while helper
+#                processes search the same position, each trying quiet moves in
+#                its own random order and every other one going a depth deeper.
+#                They do not talk to each other except through a transposition
+#                table in shared memory, so a helper that finds a good move
+#                early saves the others work. The table has no locks: each entry
+#                is stored as its key XOR its data next to its data, so a half
+#                written entry does not match its key and is ignored. The move
+#                played is always the main search's, so with one worker the
+#                result is the same every time for a fixed depth.
+#
+#                Usage: python smp.py [--workers N] [--depth 5] [--time 5]
+#                                     [--compare]
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from ChessVar import ChessVar
+from engine import Engine, MAX_DEPTH
+
+# table entry data layout, all in one 64 bit word
+_SCORE_OFFSET = 1 << 31
+_NO_SQUARE = 127
+_VALID = 1 << 63
+
+
+def _pack_entry(entry):
+    """
+    Packs a (depth, score, flag, move) table entry into one 64 bit word
+    """
+    depth, score, flag, move = entry
+    if move is None:
+        initial = final = _NO_SQUARE
+    else:
+        initial, final = move
+    return (_VALID | (score + _SCORE_OFFSET) | depth << 32 | flag << 40
+            | initial << 42 | final << 49)
+
+
+def _unpack_entry(data):
+    """
+    Unpacks a word from _pack_entry back into a table entry
+    """
+    initial = data >> 42 & 127
+    move = None if initial == _NO_SQUARE else (initial, data >> 49 & 127)
+    return (data >> 32 & 255, (data & 0xFFFFFFFF) - _SCORE_OFFSET, data >> 40 & 3, move)
+
+
+class SharedTable:
+    """
+    Class for a fixed size transposition table in shared memory that any
+    number of processes can read and write at once. Each of the 2 ** bits
+    slots is two 64 bit words, the key XOR the data and the data, and a
+    new entry always replaces the old one in its slot. The first word of
+    the memory is a stop flag the main search uses to end the helpers.
+    """
+
+    def __init__(self, bits=20, name=None):
+        self._slots = 1 << bits
+        size = (1 + 2 * self._slots) * 8
+        if name is None:
+            self._memory = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            # only the process that made the memory should track and remove
+            # it, so opening it here must not register it with the resource
+            # tracker, which may be the same one the maker uses
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                self._memory = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+            self._owner = False
+        self._words = self._memory.buf.cast('Q')
+        self._mask = self._slots - 1
+
+    def get_name(self):
+        """
+        Returns the name other processes use to open the same table
+        """
+        return self._memory.name
+
+    def get(self, key):
+        """
+        Returns the (depth, score, flag, move) entry for the position hash,
+        or None if the slot holds another position or a half written entry
+        """
+        slot = ((key & self._mask) << 1) + 1
+        check = self._words[slot]
+        data = self._words[slot + 1]
+        if data & _VALID == 0 or check ^ data != key:
+            return None
+        return _unpack_entry(data)
+
+    def __setitem__(self, key, entry):
+        data = _pack_entry(entry)
+        slot = ((key & self._mask) << 1) + 1
+        self._words[slot] = key ^ data
+        self._words[slot + 1] = data
+
+    def clear(self):
+        """
+        Empties every slot and clears the stop flag
+        """
+        self._memory.buf[:] = bytes(len(self._memory.buf))
+
+    def stop(self):
+        """
+        Tells every search using the table to stop
+        """
+        self._words[0] = 1
+
+    def stopped(self):
+        """
+        Returns True once stop has been called
+        """
+        return self._words[0] != 0
+
+    def reset_stop(self):
+        """
+        Clears the stop flag before a new search
+        """
+        self._words[0] = 0
+
+    def close(self):
+        """
+        Closes the table, and removes the memory if this process made it
+        """
+        self._words.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+_helper_tables = {}
+
+
+def _helper_search(table_name, bits, number, packed, depth, time_limit):
+    """
+    Runs one helper search in a worker process. The table is opened once
+    per process and kept for later searches. Returns the helper's number,
+    completed depth, nodes and seconds
+    """
+    table = _helper_tables.get(table_name)
+    if table is None:
+        table = _helper_tables[table_name] = SharedTable(bits, table_name)
+    engine = Engine(table=table, seed=number)
+    engine.set_stop(table.stopped)
+    if depth is not None and number % 2 == 1:
+        depth = min(depth + 1, MAX_DEPTH)
+    result = engine.search(ChessVar.from_bytes(packed), depth, time_limit)
+    return number, result.get_depth(), result.get_nodes(), result.get_seconds()
+
+
+class ParallelResult:
+    """
+    Class holding the main search's result along with the nodes and speed
+    of every worker
+    """
+
+    def __init__(self, result, workers, seconds):
+        self._result = result
+        self._workers = workers
+        self._seconds = seconds
+
+    def get_move(self):
+        """
+        Returns the move the main search picked as a pair of spots
+        """
+        return self._result.get_move()
+
+    def get_score(self):
+        """
+        Returns the main search's score for the move
+        """
+        return self._result.get_score()
+
+    def get_depth(self):
+        """
+        Returns the deepest depth the main search completed
+        """
+        return self._result.get_depth()
+
+    def get_nodes(self):
+        """
+        Returns how many positions all of the workers searched together
+        """
+        return sum(worker['nodes'] for worker in self._workers)
+
+    def get_seconds(self):
+        """
+        Returns how long the search took in seconds
+        """
+        return self._seconds
+
+    def get_nodes_per_second(self):
+        """
+        Returns how many positions all of the workers searched per second
+        """
+        if self._seconds <= 0:
+            return 0.0
+        return self.get_nodes() / self._seconds
+
+    def get_worker_stats(self):
+        """
+        Returns a list with a dictionary for each worker, main search first,
+        holding its completed depth, nodes, seconds and nodes per second
+        """
+        return [dict(worker) for worker in self._workers]
+
+
+class ParallelEngine:
+    """
+    Class for a Lazy SMP search over a number of worker processes. The
+    shared table and the process pool are kept between searches.
+    """
+
+    def __init__(self, workers=4, table_bits=20):
+        self._workers = workers
+        self._table_bits = table_bits
+        self._table = SharedTable(table_bits)
+        self._engine = Engine(table=self._table)
+        self._engine.set_stop(self._table.stopped)
+        self._pool = None
+        if workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=workers - 1)
+        self._last_result = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get_last_result(self):
+        """
+        Returns the ParallelResult of the last search, or None
+        """
+        return self._last_result
+
+    def clear(self):
+        """
+        Empties the shared table and the main search's killer moves
+        """
+        self._engine.clear()
+
+    def search(self, game, depth=None, time_limit=1.0):
+        """
+        Searches the game's position with every worker and returns a
+        ParallelResult with the main search's move. The helpers are told
+        to stop as soon as the main search finishes
+        """
+        start = time.perf_counter()
+        self._table.reset_stop()
+        helpers = []
+        if self._pool is not None:
+            packed = game.to_bytes()
+            helpers = [self._pool.submit(_helper_search, self._table.get_name(), self._table_bits,
+                                         number, packed, depth, time_limit)
+                       for number in range(1, self._workers)]
+        try:
+            result = self._engine.search(game, depth, time_limit)
+        finally:
+            self._table.stop()
+        workers = [{'worker': 0, 'depth': result.get_depth(), 'nodes': result.get_nodes(),
+                    'seconds': result.get_seconds(),
+                    'nodes_per_second': result.get_nodes_per_second()}]
+        for helper in helpers:
+            number, completed, nodes, seconds = helper.result()
+            workers.append({'worker': number, 'depth': completed, 'nodes': nodes,
+                            'seconds': seconds,
+                            'nodes_per_second': nodes / seconds if seconds > 0 else 0.0})
+        self._last_result = ParallelResult(result, workers, time.perf_counter() - start)
+        return self._last_result
+
+    def close(self):
+        """
+        Shuts down the pool and frees the shared table
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._table is not None:
+            self._table.close()
+            self._table = None
+
+
+def main(argv=None):
+    """
+    Searches the starting position from the command line and prints the
+    speed of each worker, and with --compare the speedup over one worker
+    """
+    parser = argparse.ArgumentParser(description='Search a ChessVar position on many cores.')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--depth', type=int, default=5)
+    parser.add_argument('--time', type=float, default=None, help='time limit in seconds')
+    parser.add_argument('--compare', action='store_true',
+                        help='also search with one worker and print the speedup')
+    args = parser.parse_args(argv)
+
+    single = None
+    if args.compare:
+        with ParallelEngine(1) as engine:
+            single = engine.search(ChessVar(), args.depth, args.time)
+    with ParallelEngine(args.workers) as engine:
+        result = engine.search(ChessVar(), args.depth, args.time)
+
+    print('move %s%s, score %d, depth %d, %d nodes in %.2fs (%.0f nodes/sec)'
+          % (result.get_move()[0], result.get_move()[1], result.get_score(), result.get_depth(),
+             result.get_nodes(), result.get_seconds(), result.get_nodes_per_second()))
+    for worker in result.get_worker_stats():
+        print('  worker %d: depth %d, %d nodes, %.0f nodes/sec'
+              % (worker['worker'], worker['depth'], worker['nodes'], worker['nodes_per_second']))
+    if single is not None:
+        print('one worker took %.2fs, speedup %.2fx'
+              % (single.get_seconds(), single.get_seconds() / result.get_seconds()
+                 if result.get_seconds() > 0 else 0.0))
+
+
+if __name__ == '__main__':
+    main()